@@ -2,6 +2,8 @@ import glob
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta, timezone
 import re
+import threading
+import numpy as np
 from thefuzz import fuzz
 from tkapi import TKApi
 from tkapi.vergadering import Vergadering, VergaderingSoort
@@ -159,6 +161,75 @@ def evaluate_time_match(xml_start, xml_end, api_start, api_end):
         reason = 'Timeframes overlap'
     return score, reason
 
+
+# Vectorised form of evaluate_time_match, shared with the speaker-quote and
+# personen/zaken tests: times are integer epoch microseconds, so each datetime
+# is converted once and one XML timeframe is classified against all API
+# timeframes in a single numpy pass.
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+_TIME_PROXIMITY_US = TIME_START_PROXIMITY_TOLERANCE_SECONDS * 1_000_000
+_TIME_BUFFER_US = TIME_GENERAL_OVERLAP_BUFFER_SECONDS * 1_000_000
+
+TIME_MATCH_NONE = 0
+TIME_MATCH_START_CLOSE = 1
+TIME_MATCH_START_CLOSE_OVERLAP = 2
+TIME_MATCH_OVERLAP = 3
+TIME_MATCH_RESULTS = (  # (score, reason) per code
+    (0.0, 'No significant time match'),
+    (SCORE_TIME_START_PROXIMITY, 'Start times close'),
+    (SCORE_TIME_START_PROXIMITY, 'Start times close & overlap'),
+    (SCORE_TIME_OVERLAP_ONLY, 'Timeframes overlap'),
+)
+TIME_MATCH_SCORES = np.array([score for score, _ in TIME_MATCH_RESULTS], dtype=np.float64)
+
+
+def epoch_us(dt_utc):
+    """Exact integer microseconds since the Unix epoch for an aware datetime (None passes through)."""
+    if dt_utc is None:
+        return None
+    return (dt_utc - _EPOCH_UTC) // _ONE_US
+
+
+def time_match_codes(xml_start, xml_end, api_start, api_end, valid):
+    """Classify one XML timeframe against arrays of API timeframes.
+
+    Same rules as :func:`evaluate_time_match`: start times within the
+    proximity tolerance count as close; timeframes overlap once the API side
+    is widened by the general buffer. All times are epoch microseconds
+    (*api_start*/*api_end* as ``int64`` arrays); candidates where *valid* is
+    False (missing begin or einde) get ``TIME_MATCH_NONE``.
+    """
+    start_close = np.abs(api_start - xml_start) <= _TIME_PROXIMITY_US
+    overlap = (np.maximum(api_start - _TIME_BUFFER_US, xml_start)
+               < np.minimum(api_end + _TIME_BUFFER_US, xml_end))
+    codes = np.where(
+        start_close,
+        np.where(overlap, TIME_MATCH_START_CLOSE_OVERLAP, TIME_MATCH_START_CLOSE),
+        np.where(overlap, TIME_MATCH_OVERLAP, TIME_MATCH_NONE),
+    )
+    return np.where(valid, codes, TIME_MATCH_NONE)
+
+
+# Vergadering.expand_params is class state, so concurrent lookups from the
+# worker pools in the other VLOS tests would otherwise clobber each other's
+# expansion.
+_VERGADERING_EXPAND_LOCK = threading.Lock()
+
+
+def get_vergaderingen_with_verslag(api, v_filter, max_items=5):
+    """Vergaderingen matching *v_filter*, fetched with their Verslag expanded.
+
+    Holds a module-wide lock while ``expand_params`` is set and always
+    resets it, so callers may run from several threads.
+    """
+    with _VERGADERING_EXPAND_LOCK:
+        Vergadering.expand_params = ['Verslag']
+        try:
+            return api.get_items(Vergadering, filter=v_filter, max_items=max_items)
+        finally:
+            Vergadering.expand_params = None
+
 # ---------------------------------------------------------------------------
 # Test routine
 # ---------------------------------------------------------------------------
@@ -210,9 +281,7 @@ def test_sample_vlos_files_agendapunt_matching():
             except ValueError:
                 pass
 
-        Vergadering.expand_params = ['Verslag']
-        vergaderingen = api.get_items(Vergadering, filter=v_filter, max_items=5)
-        Vergadering.expand_params = None
+        vergaderingen = get_vergaderingen_with_verslag(api, v_filter)
         assert vergaderingen, 'No TKApi Vergadering found for XML file.'
         canonical_verg = vergaderingen[0]
         print(f'Canonical Vergadering chosen: {canonical_verg.id} ({canonical_verg.titel})')
@@ -1,8 +1,20 @@
 import glob
-import xml.etree.ElementTree as ET
+import heapq
+import itertools
+import json
+import os
+import pytest
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from lxml import etree as ET
 from datetime import datetime, timedelta, timezone
 import re
-from thefuzz import fuzz
+from functools import lru_cache
+import numpy as np
+from rapidfuzz import fuzz, process
 from tkapi import TKApi
 from tkapi.vergadering import Vergadering, VergaderingSoort
 from tkapi.activiteit import Activiteit
@@ -10,7 +22,8 @@ from tkapi.zaak import Zaak  # Zaak linking
 from tkapi.dossier import Dossier  # NEW – link <dossiernummer>
 from tkapi.document import Document  # NEW – link <stuknummer> (volgnummer)
 # ---------------- Person-matching helpers ----------------------------------
-from typing import Optional, List
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional, List, Set, Tuple
 from tkapi.persoon import Persoon
 
 # ---------------------------------------------------------------------------
@@ -18,57 +31,261 @@ from tkapi.persoon import Persoon
 # ---------------------------------------------------------------------------
 
 
+# A surname ratio below 40 can never lift a candidate to the 60-point acceptance
+# threshold (the first-name boost adds at most 40), and first names only count
+# from 60 upwards – rapidfuzz may bail out early on anything below those.
+SURNAME_RATIO_CUTOFF = 40
+FIRSTNAME_RATIO_CUTOFF = 60
+
+
+def _fuzz_ratio(s1: str, s2: str, score_cutoff: float = 0, scorer=fuzz.ratio) -> int:
+    """``fuzz.ratio`` rounded to an int like thefuzz did, with rapidfuzz early exit.
+
+    The cutoff is lowered by one point so scores that *round* up to the
+    threshold are still computed; anything below returns 0.
+    """
+    return round(scorer(s1, s2, score_cutoff=max(score_cutoff - 1, 0)))
+
+
+def _cdist_ratios(queries: List[str], choices: List[str], score_cutoff: float = 0,
+                  scorer=fuzz.ratio) -> List[List[int]]:
+    """Batched :func:`_fuzz_ratio` – one row of rounded scores per query.
+
+    ``process.cdist`` scores the whole query × choice matrix in a single
+    native call instead of one Python round-trip per pair.
+    """
+    if not choices:
+        return [[] for _ in queries]
+    matrix = process.cdist(
+        queries,
+        choices,
+        scorer=scorer,
+        score_cutoff=max(score_cutoff - 1, 0),
+        dtype=np.float64,
+    )
+    return [[round(v) for v in row] for row in matrix.tolist()]
+
+
+def _cdist_row(query: str, choices: List[str], score_cutoff: float = 0,
+               scorer=fuzz.ratio) -> np.ndarray:
+    """Single-query :func:`_cdist_ratios` as an int array for numpy post-processing."""
+    if not choices:
+        return np.zeros(0, dtype=np.int64)
+    row = process.cdist(
+        [query],
+        choices,
+        scorer=scorer,
+        score_cutoff=max(score_cutoff - 1, 0),
+        dtype=np.float64,
+    )[0]
+    # np.rint rounds half to even, exactly like round()
+    return np.rint(row).astype(np.int64)
+
+
+def _length_ok(a: str, b: str, score_cutoff: float) -> bool:
+    """O(1) gate: False when ``fuzz.ratio(a, b)`` cannot reach *score_cutoff*.
+
+    The Indel ratio is at most ``200 * min(len) / (len(a) + len(b))``; the
+    bound uses the same ``score_cutoff - 1`` slack as :func:`_cdist_ratios`.
+    """
+    total = len(a) + len(b)
+    return total == 0 or 200 * min(len(a), len(b)) >= (score_cutoff - 1) * total
+
+
+def _needs_ratio(a: str, b: str, score_cutoff: float) -> bool:
+    """True when a fuzzy score for *a* vs *b* can matter: not equal, length permitting."""
+    return a != b and _length_ok(a, b, score_cutoff)
+
+
+@lru_cache(maxsize=4096)
+def _full_surname(tussenvoegsel: str, achternaam: str) -> str:
+    # split/join collapses (and strips) whitespace without the regex engine
+    return ' '.join(f"{tussenvoegsel} {achternaam}".split()).lower()
+
+
 def _build_full_surname(p: Persoon) -> str:
     """Return full surname including tussenvoegsel (if any)."""
-    full = f"{p.tussenvoegsel} {p.achternaam}".strip()
-    return re.sub(r"\s+", " ", full).lower()
+    # Persoon objects are not hashable – cache on the name parts instead
+    return _full_surname(p.tussenvoegsel, p.achternaam)
+
+
+def _name_keys(p: Persoon) -> Tuple[str, str, str, str]:
+    """Lowercased (achternaam, full surname, roepnaam, voornamen) of *p*.
+
+    Personen are long-lived (shared through the persoon caches and roster
+    index), so the tuple is computed once and kept on the object itself.
+    """
+    keys = getattr(p, '_name_keys', None)
+    if keys is None:
+        keys = (
+            (p.achternaam or "").lower(),
+            _build_full_surname(p),
+            (getattr(p, "roepnaam", None) or "").lower(),
+            (getattr(p, "voornamen", None) or "").lower(),
+        )
+        try:
+            p._name_keys = keys
+        except AttributeError:  # objects without a __dict__
+            pass
+    return keys
+
+
+def _persoon_display(p: Persoon) -> Tuple[str, str]:
+    """(display name, "name (id …)" label) of *p*, built once and kept on the object."""
+    display = getattr(p, '_display', None)
+    if display is None:
+        name = f"{p.roepnaam or p.voornaam} {p.achternaam}"
+        display = (name, sys.intern(f"{name} (id {p.id})"))
+        try:
+            p._display = display
+        except AttributeError:  # objects without a __dict__
+            pass
+    return display
+
+
+def _name_score(surname_exact: bool, surname_ratio: int, first_ratio: int) -> int:
+    """Combine surname and first-name similarity into the 0-100 name score."""
+    if surname_exact:
+        # Exact match on either variant → big boost
+        score = 60
+    else:
+        # Convert fuzzy similarity to 0-60 scale (same logic as earlier: dampen by 20)
+        score = max(surname_ratio - 20, 0)
+
+    # Firstname / roepnaam boost (unchanged logic)
+    if first_ratio >= FUZZY_FIRSTNAME_THRESHOLD:
+        score += 40
+    elif first_ratio >= 60:
+        score += 20
+
+    return min(score, 100)  # cap
+
+
+def _name_scores_np(surname_exact, surname_ratio: np.ndarray, first_ratio: np.ndarray) -> np.ndarray:
+    """:func:`_name_score` applied element-wise to whole candidate arrays."""
+    score = np.where(surname_exact, 60, np.maximum(surname_ratio - 20, 0))
+    score = score + np.where(first_ratio >= FUZZY_FIRSTNAME_THRESHOLD, 40,
+                             np.where(first_ratio >= 60, 20, 0))
+    return np.minimum(score, 100)
 
 
 # Shadow/replace the imported helper with an enhanced version
-def calc_name_similarity(v_first: str, v_last: str, p: Persoon) -> int:  # type: ignore
-    """Similarity score combining full surname (tv + achternaam) and optional first name."""
+def calc_name_similarity(v_first: str, v_last: str, p: Persoon,
+                         v_last_lower: Optional[str] = None) -> int:  # type: ignore
+    """Similarity score combining full surname (tv + achternaam) and optional first name.
 
-    score = 0
+    Callers scoring one speaker against many Personen may pass the already
+    lowercased surname as *v_last_lower*.
+    """
 
     if not (v_last and p.achternaam):
-        return score
+        return 0
 
-    v_last_lower = v_last.lower()
+    if v_last_lower is None:
+        v_last_lower = v_last.lower()
 
-    bare_surname = p.achternaam.lower()
-    full_surname = _build_full_surname(p)
+    bare_surname, full_surname, roepnaam, voornamen = _name_keys(p)
 
-    # Pick best of bare vs full surname similarity
-    ratio_bare = fuzz.ratio(v_last_lower, bare_surname)
-    ratio_full = fuzz.ratio(v_last_lower, full_surname)
+    # Pick best of bare vs full surname similarity; the full variant is compared
+    # on sorted tokens so "Berg van den" still lines up with "van den Berg" (and
+    # has no length bound, so only the bare ratio is length-gated). Not
+    # token_set_ratio: that scores a token subset ("dijk" in "van dijk") as 100,
+    # lifting a non-exact surname above an exact one.
+    ratio_bare = (
+        _fuzz_ratio(v_last_lower, bare_surname, SURNAME_RATIO_CUTOFF)
+        if _length_ok(v_last_lower, bare_surname, SURNAME_RATIO_CUTOFF) else 0
+    )
+    ratio_full = _fuzz_ratio(v_last_lower, full_surname, SURNAME_RATIO_CUTOFF, fuzz.token_sort_ratio)
     best_ratio = max(ratio_bare, ratio_full)
 
-    # Exact match on either variant → big boost
-    if v_last_lower in [bare_surname, full_surname]:
-        score += 60
-    else:
-        # Convert fuzzy similarity to 0-60 scale (same logic as earlier: dampen by 20)
-        score += max(best_ratio - 20, 0)
+    best_first = 0
+    v_first_lower = (v_first or "").lower()
+    if v_first_lower:
+        best_first = max(
+            (
+                _fuzz_ratio(v_first_lower, fc_lower, FIRSTNAME_RATIO_CUTOFF)
+                for fc_lower in (roepnaam, voornamen)
+                if fc_lower and _length_ok(v_first_lower, fc_lower, FIRSTNAME_RATIO_CUTOFF)
+            ),
+            default=0,
+        )
+
+    return _name_score(v_last_lower in [bare_surname, full_surname], best_ratio, best_first)
+
+
+class _NameCandidates:
+    """Candidate Personen with their name variants lowercased once.
+
+    Lets many speaker names be scored against the same candidates without
+    re-lowercasing surnames and first names for every name.
+    """
+
+    __slots__ = ('personen', 'bare', 'full', 'first_names', 'has_surname')
+
+    def __init__(self, personen: List[Persoon]):
+        self.personen = personen
+        keys = [_name_keys(p) for p in personen]
+        self.bare = [k[0] for k in keys]
+        self.full = [k[1] for k in keys]
+        # roepnamen then voornamen; missing ones are scored against "" (→ 0)
+        self.first_names = [k[2] for k in keys] + [k[3] for k in keys]
+        self.has_surname = np.array([bool(b) for b in self.bare], dtype=bool)
+
+
+def _as_candidates(personen) -> _NameCandidates:
+    return personen if isinstance(personen, _NameCandidates) else _NameCandidates(personen)
+
+
+def _name_similarity_scores(v_first: str, v_last: str, personen) -> np.ndarray:
+    """Vectorised :func:`calc_name_similarity` over candidate Personen.
+
+    *personen* is a list of Personen or a prebuilt :class:`_NameCandidates`.
+    """
+    n = len(personen.personen if isinstance(personen, _NameCandidates) else personen)
+    if not (v_last and n):
+        return np.zeros(n, dtype=np.int64)
+    cands = _as_candidates(personen)
+
+    v_last_lower = v_last.lower()
+    surname_ratio = np.maximum(
+        _cdist_row(v_last_lower, cands.bare, SURNAME_RATIO_CUTOFF),
+        _cdist_row(v_last_lower, cands.full, SURNAME_RATIO_CUTOFF, fuzz.token_sort_ratio),
+    )
+    surname_exact = np.array([v_last_lower in (b, f) for b, f in zip(cands.bare, cands.full)], dtype=bool)
 
-    # ---------------------------------------------
-    # Firstname / roepnaam boost (unchanged logic)
-    # ---------------------------------------------
     v_first_lower = (v_first or "").lower()
     if v_first_lower:
-        first_candidates = [c for c in [getattr(p, "roepnaam", None), getattr(p, "voornamen", None)] if c]
-        best_first = max((fuzz.ratio(v_first_lower, fc.lower()) for fc in first_candidates), default=0)
-        if best_first >= FUZZY_FIRSTNAME_THRESHOLD:
-            score += 40
-        elif best_first >= 60:
-            score += 20
+        first_row = _cdist_row(v_first_lower, cands.first_names, FIRSTNAME_RATIO_CUTOFF)
+        first_ratio = np.maximum(first_row[:n], first_row[n:])
+    else:
+        first_ratio = np.zeros(n, dtype=np.int64)
+
+    scores = _name_scores_np(surname_exact, surname_ratio, first_ratio)
+    return np.where(cands.has_surname, scores, 0)
+
+
+def _first_persoon_match(v_first: str, v_last: str, personen) -> Optional[Persoon]:
+    """Return the first Persoon scoring ≥60 (an exact surname always does), else None."""
+    cands = _as_candidates(personen)
+    hits = np.flatnonzero(_name_similarity_scores(v_first, v_last, cands) >= 60)
+    return cands.personen[hits[0]] if hits.size else None
 
-    return min(score, 100)  # cap
+
+def _pick_best_persoon(v_first: str, v_last: str, personen) -> Optional[Persoon]:
+    """Return the first Persoon with the highest name score ≥60, else None."""
+    cands = _as_candidates(personen)
+    scores = _name_similarity_scores(v_first, v_last, cands)
+    if not scores.size:
+        return None
+    best_idx = int(np.argmax(scores))  # first maximum, like max()
+    return cands.personen[best_idx] if scores[best_idx] >= 60 else None
 
 # ---------------------------------------------------------------------------
 # Zaak matching helpers
 # ---------------------------------------------------------------------------
 
 
+@lru_cache(maxsize=4096)
 def _safe_int(val: str):
     """Return int(val) if val represents an integer, else None."""
     try:
@@ -77,15 +294,134 @@ def _safe_int(val: str):
         return None
 
 
+# ---------------------------------------------------------------------------
+# Module-level lookup caches – the same dossier/stuk/speaker keys recur across
+# fragments and files, and every miss costs a TK-API round-trip.
+# ---------------------------------------------------------------------------
+_ZAAK_CACHE: Dict[Tuple[str, str], Optional[Zaak]] = {}
+_DOSSIER_CACHE: Dict[str, Optional[Dossier]] = {}
+_DOCUMENT_CACHE: Dict[Tuple[Optional[int], Optional[str], int], Optional[Document]] = {}
+_PERSOON_CACHE: Dict[Tuple[str, str], Optional[Persoon]] = {}
+_ZAAK_OR_FALLBACK_CACHE: Dict[Tuple[str, str], dict] = {}
+
+
+def clear_lookup_caches() -> None:
+    """Forget every TK-API lookup result held by this module."""
+    global _PERSOON_INDEX
+    for cache in (_ZAAK_CACHE, _DOSSIER_CACHE, _DOCUMENT_CACHE, _PERSOON_CACHE,
+                  _PERSOON_CACHE_TS, _ZAAK_OR_FALLBACK_CACHE):
+        cache.clear()
+    _PERSOON_INDEX = None
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _fresh_lookup_caches():
+    """Keep lookup results from leaking into other test modules."""
+    yield
+    clear_lookup_caches()
+
+# Persoon matches can also be kept on disk between runs: the same few hundred
+# Kamerleden speak in every sample, so a warm cache skips nearly all speaker
+# lookups.  Opt-in – set VLOS_PERSOON_CACHE to the cache file path (e.g.
+# .tkapi_cache/persoon.json) – so a plain test run neither depends on nor
+# writes local state.  Entries store the raw Persoon json (no HTTP needed to
+# rebuild) together with the time they were resolved; misses are not stored.
+PERSOON_DISK_CACHE_PATH = os.getenv('VLOS_PERSOON_CACHE') or None
+PERSOON_DISK_CACHE_TTL = 30 * 24 * 3600  # seconds
+# Bump whenever name resolution changes (candidate lookup or scoring): cache
+# files written by another resolver version are discarded, not replayed
+PERSOON_RESOLVER_VERSION = 2
+_PERSOON_CACHE_TS: Dict[Tuple[str, str], float] = {}
+
+
+def load_persoon_disk_cache(path: Optional[str] = PERSOON_DISK_CACHE_PATH) -> int:
+    """Seed ``_PERSOON_CACHE`` from *path*, skipping expired entries.
+
+    Files from another :data:`PERSOON_RESOLVER_VERSION` are ignored, as are
+    malformed entries – a damaged cache only costs queries. Returns the number
+    of entries loaded (0 when the disk cache is disabled).
+    """
+    if not path:
+        return 0
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if not isinstance(data, dict) or data.get('resolver_version') != PERSOON_RESOLVER_VERSION:
+        return 0
+    entries = data.get('entries')
+    if not isinstance(entries, list):
+        return 0
+    now = time.time()
+    loaded = 0
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        first, last = entry.get('first'), entry.get('last')
+        ts = entry.get('ts', 0)
+        persoon_json = entry.get('persoon')
+        if not (isinstance(first, str) and isinstance(last, str) and isinstance(persoon_json, dict)):
+            continue
+        if isinstance(ts, bool) or not isinstance(ts, (int, float)) or now - ts > PERSOON_DISK_CACHE_TTL:
+            continue
+        key = _persoon_key(first, last)
+        if key in _PERSOON_CACHE:
+            continue
+        _PERSOON_CACHE[key] = Persoon(persoon_json)
+        _PERSOON_CACHE_TS[key] = ts
+        loaded += 1
+    return loaded
+
+
+def save_persoon_disk_cache(path: Optional[str] = PERSOON_DISK_CACHE_PATH) -> bool:
+    """Write the resolved ``_PERSOON_CACHE`` entries to *path* (atomically, via a temp file).
+
+    Returns False when the disk cache is disabled or cannot be written; a
+    read-only checkout only loses the cache, not the test run.
+    """
+    if not path:
+        return False
+    now = time.time()
+    entries = [
+        {
+            'first': first,
+            'last': last,
+            'ts': _PERSOON_CACHE_TS.get((first, last), now),
+            'persoon': p.json,
+        }
+        for (first, last), p in list(_PERSOON_CACHE.items())
+        if p is not None
+    ]
+    tmp_path = path + '.tmp'
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'resolver_version': PERSOON_RESOLVER_VERSION, 'entries': entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
 def find_best_zaak(api: TKApi, dossiernummer: str, stuknummer: str) -> Optional[Zaak]:
     """Retrieve a TK-API Zaak by dossier- and/or stuknummer (volgnummer).
 
     Uses the most restrictive combination of filters available.
     Returns the single best candidate (first hit) or None.
     """
-    if not dossiernummer and not stuknummer:
-        return None
+    key = (dossiernummer, stuknummer)
+    if key not in _ZAAK_CACHE:
+        _ZAAK_CACHE[key] = _query_best_zaak(api, dossiernummer, stuknummer)
+    return _ZAAK_CACHE[key]
+
 
+def _zaak_filter(dossiernummer: str, stuknummer: str):
+    """Most restrictive Zaak filter for a dossier-/stuknummer pair."""
     zf = Zaak.create_filter()
 
     dnr_int = _safe_int(dossiernummer)
@@ -102,8 +438,11 @@ def find_best_zaak(api: TKApi, dossiernummer: str, stuknummer: str) -> Optional[
         zf.filter_document(snr_int)
     elif stuknummer:
         zf.filter_volgnummer(stuknummer)
+    return zf
 
-    candidates = api.get_items(Zaak, filter=zf, max_items=10)
+
+def _select_best_zaak(candidates: List[Zaak], dossiernummer: str, stuknummer: str) -> Optional[Zaak]:
+    """Pick the best of (at most 10) candidate Zaken for a dossier-/stuknummer pair."""
     if not candidates:
         return None
 
@@ -111,6 +450,8 @@ def find_best_zaak(api: TKApi, dossiernummer: str, stuknummer: str) -> Optional[
     if len(candidates) == 1:
         return candidates[0]
 
+    dnr_int = _safe_int(dossiernummer)
+    snr_int = _safe_int(stuknummer)
     for z in candidates:
         if (dnr_int and _safe_int(z.dossier.nummer) == dnr_int) and (
             snr_int is None or _safe_int(z.volgnummer) == snr_int
@@ -120,6 +461,13 @@ def find_best_zaak(api: TKApi, dossiernummer: str, stuknummer: str) -> Optional[
     return candidates[0]
 
 
+def _query_best_zaak(api: TKApi, dossiernummer: str, stuknummer: str) -> Optional[Zaak]:
+    if not dossiernummer and not stuknummer:
+        return None
+    candidates = api.get_items(Zaak, filter=_zaak_filter(dossiernummer, stuknummer), max_items=10)
+    return _select_best_zaak(candidates, dossiernummer, stuknummer)
+
+
 def find_best_zaak_or_fallback(api: TKApi, dossiernummer: str, stuknummer: str) -> dict:
     """Enhanced zaak finding with dossier fallback.
     
@@ -129,7 +477,17 @@ def find_best_zaak_or_fallback(api: TKApi, dossiernummer: str, stuknummer: str)
     - 'document': Document object if applicable
     - 'match_type': 'zaak', 'dossier_fallback', or 'no_match'
     - 'success': bool indicating if any match was found
+
+    Results are memoised per (dossiernummer, stuknummer) and shared between
+    callers, so treat the returned dict as read-only.
     """
+    key = (dossiernummer, stuknummer)
+    if key not in _ZAAK_OR_FALLBACK_CACHE:
+        _ZAAK_OR_FALLBACK_CACHE[key] = _zaak_or_fallback(api, dossiernummer, stuknummer)
+    return _ZAAK_OR_FALLBACK_CACHE[key]
+
+
+def _zaak_or_fallback(api: TKApi, dossiernummer: str, stuknummer: str) -> dict:
     result = {
         'zaak': None,
         'dossier': None, 
@@ -173,6 +531,7 @@ def find_best_zaak_or_fallback(api: TKApi, dossiernummer: str, stuknummer: str)
 _DOSSIER_REGEX = re.compile(r"^(\d+)(?:[-\s]?([A-Za-z0-9]+))?$")
 
 
+@lru_cache(maxsize=4096)
 def _split_dossier_code(code: str):
     """Return (nummer:int|None, toevoeging:str|None) for a dossier code like '36725-VI'."""
     m = _DOSSIER_REGEX.match(code.strip()) if code else None
@@ -184,88 +543,298 @@ def _split_dossier_code(code: str):
 
 
 def find_best_dossier(api: TKApi, dossier_code: str) -> Optional[Dossier]:
+    if dossier_code not in _DOSSIER_CACHE:
+        _DOSSIER_CACHE[dossier_code] = _query_best_dossier(api, dossier_code)
+    return _DOSSIER_CACHE[dossier_code]
+
+
+def _query_best_dossier(api: TKApi, dossier_code: str) -> Optional[Dossier]:
     num, toevoeg = _split_dossier_code(dossier_code or "")
     if num is None:
         return None
+    items = api.get_items(Dossier, filter=_dossier_filter(num, toevoeg), max_items=5)
+    return items[0] if items else None
+
+
+def _dossier_filter(num: int, toevoeg: Optional[str]):
     df = Dossier.create_filter()
     df.filter_nummer(num)
     if toevoeg:
         df.filter_toevoeging(toevoeg)
-    items = api.get_items(Dossier, filter=df, max_items=5)
-    return items[0] if items else None
+    return df
 
 
 def find_best_document(api: TKApi, dossier_num: int, dossier_toevoeging: str, stuknummer: str) -> Optional[Document]:
     snr_int = _safe_int(stuknummer)
     if snr_int is None:
         return None
+    # Keyed on the parsed volgnummer, so e.g. "3" and "03" share one lookup
+    key = (dossier_num, dossier_toevoeging, snr_int)
+    if key not in _DOCUMENT_CACHE:
+        _DOCUMENT_CACHE[key] = _query_best_document(api, dossier_num, dossier_toevoeging, stuknummer)
+    return _DOCUMENT_CACHE[key]
+
+
+def _query_best_document(api: TKApi, dossier_num: int, dossier_toevoeging: str, stuknummer: str) -> Optional[Document]:
+    snr_int = _safe_int(stuknummer)
+    if snr_int is None:
+        return None
+    docs = api.get_items(Document, filter=_document_filter(dossier_num, dossier_toevoeging, snr_int), max_items=5)
+    return docs[0] if docs else None
+
+
+def _document_filter(dossier_num: int, dossier_toevoeging: Optional[str], snr_int: int):
     df = Document.create_filter()
     df.filter_volgnummer(snr_int)
     # Narrow by dossier association
     if dossier_num:
         df.filter_dossier(dossier_num, dossier_toevoeging)
-    docs = api.get_items(Document, filter=df, max_items=5)
-    return docs[0] if docs else None
+    return df
+
+
+# ---------------------------------------------------------------------------
+# Bulk prefetch of the Zaken / Dossiers / Documenten referenced in one file
+# ---------------------------------------------------------------------------
+
+# Filter clauses per OR'd query (each clause is a full per-reference filter)
+ZAAK_PREFETCH_CHUNK_SIZE = 10
+
+
+class _ZaakWithRelations(Zaak):
+    """Zaak fetched with its Kamerstukdossiers and Documenten inline."""
+    expand_params = ['Kamerstukdossier', 'Document']
+
+
+class _DocumentWithDossiers(Document):
+    """Document fetched with its Kamerstukdossiers inline."""
+    expand_params = ['Kamerstukdossier']
+
+
+# Chunk queries in flight at once – TKApi issues stateless requests.get calls,
+# so one instance can be shared by the worker threads
+PREFETCH_WORKERS = 8
+
+
+def _get_items_any(api: TKApi, tkitem, filters: list) -> list:
+    """Fetch all items matching any of ``filters`` with chunked OR'd queries.
+
+    Chunks are fetched concurrently; results keep chunk order.
+    """
+    chunk_filters = []
+    for i in range(0, len(filters), ZAAK_PREFETCH_CHUNK_SIZE):
+        f = tkitem.create_filter()
+        # Parenthesised: TKApi appends "and Verwijderd eq false" to the filter
+        f.add_filter_str(
+            "(" + " or ".join(f"({flt.filter_str})" for flt in filters[i:i + ZAAK_PREFETCH_CHUNK_SIZE]) + ")"
+        )
+        chunk_filters.append(f)
+    if len(chunk_filters) <= 1:
+        return [item for f in chunk_filters for item in api.get_items(tkitem, filter=f)]
+
+    with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as ex:
+        batches = ex.map(lambda f: api.get_items(tkitem, filter=f), chunk_filters)
+        return [item for batch in batches for item in batch]
+
+
+def _related_values(item, relation: str, key: str) -> list:
+    return [rel.get(key) for rel in item.json.get(relation) or []]
+
+
+def _casefold(value) -> str:
+    """Case-insensitive form of an optional API string (e.g. toevoeging 'VII' vs 'vii')."""
+    return (value or '').casefold()
+
+
+def _zaak_matches(z: Zaak, dossiernummer: str, stuknummer: str) -> bool:
+    """Local equivalent of :func:`_zaak_filter` on a Zaak with expanded relations."""
+    dnr_int = _safe_int(dossiernummer)
+    if dnr_int is not None:
+        if dnr_int not in _related_values(z, 'Kamerstukdossier', 'Nummer'):
+            return False
+    elif dossiernummer and _casefold(z.json.get('Nummer')) != dossiernummer.casefold():
+        return False
+    snr_int = _safe_int(stuknummer)
+    return snr_int is None or snr_int in _related_values(z, 'Document', 'Volgnummer')
+
+
+def prefetch_zaak_refs(api: TKApi, refs: Iterable[Tuple[str, str]]) -> None:
+    """Resolve the (dossiernummer, stuknummer) pairs of a file with batched queries.
+
+    Fills the zaak, dossier and document caches with what :func:`find_best_zaak`,
+    :func:`find_best_dossier` and :func:`find_best_document` would return. API
+    ordering is kept per reference, so the "first hit" rules still apply. Only
+    hits are cached: a reference the batch misses is left to the per-call query.
+    """
+    refs = set(refs)
+
+    # Zaken – only narrow references are batched: a zaak nummer, or dossier +
+    # stuknummer. Broad ones (all zaken of a dossier, every zaak with some
+    # volgnummer) rely on the per-call max_items=10 and go through find_best_zaak.
+    zaak_keys = []
+    for dnr, snr in refs:
+        if not dnr or (dnr, snr) in _ZAAK_CACHE:
+            continue
+        snr_ok = _safe_int(snr) is not None
+        if (_safe_int(dnr) is None and (snr_ok or not snr)) or (_safe_int(dnr) is not None and snr_ok):
+            zaak_keys.append((dnr, snr))
+    if zaak_keys:
+        zaken = _get_items_any(api, _ZaakWithRelations, [_zaak_filter(dnr, snr) for dnr, snr in zaak_keys])
+        for dnr, snr in zaak_keys:
+            best = _select_best_zaak([z for z in zaken if _zaak_matches(z, dnr, snr)][:10], dnr, snr)
+            if best is not None:
+                _ZAAK_CACHE[(dnr, snr)] = best
+
+    # The broad references cannot share a query, and batch misses get their
+    # own query too – resolve them concurrently
+    broad_keys = [ref for ref in refs if ref not in _ZAAK_CACHE]
+    if broad_keys:
+        with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as ex:
+            list(ex.map(lambda ref: find_best_zaak(api, *ref), broad_keys))
+
+    # Dossiers
+    dossier_keys = []
+    for dnr in {dnr for dnr, _ in refs if dnr and dnr not in _DOSSIER_CACHE}:
+        num, toevoeg = _split_dossier_code(dnr)
+        if num is None:
+            _DOSSIER_CACHE[dnr] = None
+        else:
+            dossier_keys.append((dnr, num, toevoeg))
+    if dossier_keys:
+        dossiers = _get_items_any(api, Dossier, [_dossier_filter(num, toevoeg) for _, num, toevoeg in dossier_keys])
+        for dnr, num, toevoeg in dossier_keys:
+            dossier = next(
+                (
+                    d for d in dossiers
+                    if d.nummer == num and (not toevoeg or _casefold(d.toevoeging) == toevoeg.casefold())
+                ),
+                None,
+            )
+            if dossier is not None:
+                _DOSSIER_CACHE[dnr] = dossier
+
+    # Documenten – only when narrowed by a dossier, as in the main loop
+    doc_keys = set()
+    for dnr, snr in refs:
+        num, toevoeg = _split_dossier_code(dnr)
+        snr_int = _safe_int(snr)
+        if num and snr_int is not None and (num, toevoeg, snr_int) not in _DOCUMENT_CACHE:
+            doc_keys.add((num, toevoeg, snr_int))
+    if doc_keys:
+        docs = _get_items_any(
+            api, _DocumentWithDossiers, [_document_filter(num, toevoeg, snr_int) for num, toevoeg, snr_int in doc_keys]
+        )
+        for num, toevoeg, snr_int in doc_keys:
+            doc = next(
+                (
+                    d for d in docs
+                    if d.volgnummer == snr_int
+                    and num in _related_values(d, 'Kamerstukdossier', 'Nummer')
+                    and (not toevoeg or toevoeg.casefold() in map(
+                        _casefold, _related_values(d, 'Kamerstukdossier', 'Toevoeging')
+                    ))
+                ),
+                None,
+            )
+            if doc is not None:
+                _DOCUMENT_CACHE[(num, toevoeg, snr_int)] = doc
+
+# Dossier fallback labels end in this marker (zaak labels never carry it)
+FALLBACK_MARKER = ' [FALLBACK]'
+
+
+def topic_label_display(label: str) -> str:
+    """Zaak/dossier label for reports, without the fallback marker."""
+    return label.removesuffix(FALLBACK_MARKER).strip()
+
+
+def join_head(items: List[str], n: int) -> str:
+    """', '-joined first *n* items, with '...' appended when some were left out."""
+    head = ', '.join(items[:n])
+    return head + '...' if len(items) > n else head
+
+
+# ---------------------------------------------------------------------------
+# Per-activiteit tracking records
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class SpeakerInfo:
+    """A matched speaker within one activiteit."""
+    persoon: Persoon
+    name: str
+    speech_text: str  # first 200 characters, kept as context
+
+
+@dataclass(slots=True)
+class ZaakInfo:
+    """A matched Zaak (or fallback Dossier) within one activiteit."""
+    object: object  # Zaak, or Dossier for fallback matches
+    type: str
+    label: str
+    dossiernr: str
+    stuknr: str
+    titel: str
 
 # ---------------------------------------------------------------------------
 # Voting analysis helpers
 # ---------------------------------------------------------------------------
 
-def analyze_voting_in_activity(xml_act: ET.Element, activity_zaken: List[dict]) -> List[dict]:
+@dataclass(slots=True)
+class FractieVote:
+    """One fractie's vote on a voting activiteititem."""
+    fractie: str
+    vote: str
+    vote_normalized: str  # lowercased vote
+
+
+def analyze_voting_in_activity(xml_act: ET.Element, activity_zaken: List[ZaakInfo]) -> List[dict]:
     """
     Analyze voting patterns within an activity.
     
     Returns a list of voting events with fractie votes linked to topics.
     """
     voting_events = []
+    # Shared by every event of this activity (read-only downstream)
+    topics_discussed = tuple(zaak.label for zaak in activity_zaken)
     
-    # Look for activiteititem elements with voting data
-    for item in xml_act.findall(".//vlos:activiteititem", NS):
-        soort = item.get('soort', '')
+    # Look for activiteititem elements with voting-related activity types
+    for item in _XP_VOTING_ITEMS(xml_act):
+        item_texts = _child_texts(item, _VOTING_ITEM_TAGS)
+        titel = item_texts.get(VLOS_TITEL, "")
+        besluitvorm = item_texts.get(VLOS_BESLUITVORM, "")
+        uitslag = item_texts.get(VLOS_UITSLAG, "")
         
-        # Check for voting-related activity types
-        if soort.lower() in ['besluit', 'stemming', 'vote']:
-            titel = item.findtext("vlos:titel", default="", namespaces=NS)
-            besluitvorm = item.findtext("vlos:besluitvorm", default="", namespaces=NS)
-            uitslag = item.findtext("vlos:uitslag", default="", namespaces=NS)
+        # Extract individual fractie votes
+        stemmingen_el = next(item.iterchildren(VLOS_STEMMINGEN), None)
+        if stemmingen_el is not None:
+            fractie_votes = []
+            
+            for stemming in stemmingen_el.iterchildren(VLOS_STEMMING):
+                vote_texts = _child_texts(stemming, _STEMMING_TAGS)
+                fractie_name = vote_texts.get(VLOS_FRACTIE, "")
+                stem_value = vote_texts.get(VLOS_STEM, "")
+                
+                if fractie_name and stem_value:
+                    fractie_votes.append(FractieVote(fractie_name, stem_value, stem_value.lower()))
             
-            # Extract individual fractie votes
-            stemmingen_el = item.find("vlos:stemmingen", NS)
-            if stemmingen_el is not None:
-                fractie_votes = []
+            if fractie_votes:
+                voting_event = {
+                    'type': 'fractie_voting',
+                    'titel': titel,
+                    'besluitvorm': besluitvorm,
+                    'uitslag': uitslag,
+                    'total_votes': len(fractie_votes),
+                    'fractie_votes': fractie_votes,
+                    'topics_discussed': topics_discussed,
+                    'vote_breakdown': defaultdict(list)
+                }
                 
-                for stemming in stemmingen_el.findall("vlos:stemming", NS):
-                    fractie_name = stemming.findtext("vlos:fractie", default="", namespaces=NS)
-                    stem_value = stemming.findtext("vlos:stem", default="", namespaces=NS)
-                    
-                    if fractie_name and stem_value:
-                        fractie_votes.append({
-                            'fractie': fractie_name,
-                            'vote': stem_value,
-                            'vote_normalized': stem_value.lower()
-                        })
+                # Calculate vote breakdown
+                for vote in fractie_votes:
+                    voting_event['vote_breakdown'][vote.vote_normalized].append(vote.fractie)
                 
-                if fractie_votes:
-                    voting_event = {
-                        'type': 'fractie_voting',
-                        'titel': titel,
-                        'besluitvorm': besluitvorm,
-                        'uitslag': uitslag,
-                        'total_votes': len(fractie_votes),
-                        'fractie_votes': fractie_votes,
-                        'topics_discussed': [zaak['label'] for zaak in activity_zaken],
-                        'vote_breakdown': {}
-                    }
-                    
-                    # Calculate vote breakdown
-                    for vote in fractie_votes:
-                        vote_type = vote['vote_normalized']
-                        if vote_type not in voting_event['vote_breakdown']:
-                            voting_event['vote_breakdown'][vote_type] = []
-                        voting_event['vote_breakdown'][vote_type].append(vote['fractie'])
-                    
-                    voting_events.append(voting_event)
-    
+                voting_events.append(voting_event)
+
     return voting_events
 
 
@@ -277,11 +846,15 @@ def analyze_voting_patterns(all_voting_events: List[dict]) -> dict:
         return {}
     
     # Fractie voting behavior
-    fractie_vote_counts = {}
-    fractie_topic_votes = {}
+    fractie_vote_counts = defaultdict(lambda: {'voor': 0, 'tegen': 0, 'onthouding': 0, 'niet_deelgenomen': 0, 'total': 0})
+    fractie_topic_votes = defaultdict(lambda: defaultdict(lambda: {'voor': 0, 'tegen': 0, 'onthouding': 0}))
     
     # Topic voting patterns
-    topic_vote_patterns = {}
+    topic_vote_patterns = defaultdict(lambda: {
+        'votes': {'voor': [], 'tegen': [], 'onthouding': []},
+        'consensus_level': 0,
+        'total_votes': 0
+    })
     
     # Vote type statistics
     vote_type_counts = {'voor': 0, 'tegen': 0, 'niet_deelgenomen': 0, 'onthouding': 0}
@@ -290,44 +863,30 @@ def analyze_voting_patterns(all_voting_events: List[dict]) -> dict:
         topics = event['topics_discussed']
         
         for vote in event['fractie_votes']:
-            fractie = vote['fractie']
-            vote_type = vote['vote_normalized']
+            fractie = vote.fractie
+            vote_type = vote.vote_normalized
             
             # Track overall fractie voting behavior
-            if fractie not in fractie_vote_counts:
-                fractie_vote_counts[fractie] = {'voor': 0, 'tegen': 0, 'onthouding': 0, 'niet_deelgenomen': 0, 'total': 0}
-            
-            if vote_type in fractie_vote_counts[fractie]:
-                fractie_vote_counts[fractie][vote_type] += 1
-            fractie_vote_counts[fractie]['total'] += 1
-            
-            # Track fractie votes on specific topics
-            if fractie not in fractie_topic_votes:
-                fractie_topic_votes[fractie] = {}
-            
-            for topic in topics:
-                if topic not in fractie_topic_votes[fractie]:
-                    fractie_topic_votes[fractie][topic] = {'voor': 0, 'tegen': 0, 'onthouding': 0}
-                
-                if vote_type in fractie_topic_votes[fractie][topic]:
-                    fractie_topic_votes[fractie][topic][vote_type] += 1
+            fractie_counts = fractie_vote_counts[fractie]
+            if vote_type in fractie_counts:
+                fractie_counts[vote_type] += 1
+            fractie_counts['total'] += 1
             
-            # Track topic voting patterns
+            # Track fractie votes and overall voting patterns per topic in one pass
+            fractie_topics = fractie_topic_votes[fractie]
             for topic in topics:
-                if topic not in topic_vote_patterns:
-                    topic_vote_patterns[topic] = {
-                        'votes': {'voor': [], 'tegen': [], 'onthouding': []},
-                        'consensus_level': 0,
-                        'total_votes': 0
-                    }
-                
-                if vote_type in topic_vote_patterns[topic]['votes']:
-                    topic_vote_patterns[topic]['votes'][vote_type].append(fractie)
-                topic_vote_patterns[topic]['total_votes'] += 1
-            
-            # Overall vote type counting
-            if vote_type in vote_type_counts:
-                vote_type_counts[vote_type] += 1
+                topic_counts = fractie_topics[topic]
+                pattern = topic_vote_patterns[topic]
+                if vote_type in topic_counts:
+                    topic_counts[vote_type] += 1
+                if vote_type in pattern['votes']:
+                    pattern['votes'][vote_type].append(fractie)
+                pattern['total_votes'] += 1
+        
+        # Overall vote type counting
+        event_counts = Counter(vote.vote_normalized for vote in event['fractie_votes'])
+        for vote_type in vote_type_counts:
+            vote_type_counts[vote_type] += event_counts[vote_type]
     
     # Calculate consensus levels for topics
     for topic, data in topic_vote_patterns.items():
@@ -372,21 +931,42 @@ def analyze_voting_patterns(all_voting_events: List[dict]) -> dict:
 # Interruption analysis helpers
 # ---------------------------------------------------------------------------
 
-def detect_interruptions_in_activity(xml_act: ET.Element, activity_speakers: List[dict], 
-                                    activity_zaken: List[dict]) -> List[dict]:
+@dataclass(slots=True)
+class SpeakerEntry:
+    """One <spreker> occurrence in the activity's fragment sequence."""
+    fragment_id: int
+    persoon: Optional[Persoon]
+    name: str
+    persoon_id: Optional[str]
+    speech_text: str
+    speech_length: int
+
+
+def detect_interruptions_in_activity(xml_act: ET.Element, activity_speakers: List[SpeakerInfo],
+                                    activity_zaken: List[ZaakInfo]) -> List[dict]:
     """
     Detect interruption patterns within an activity.
     
     Returns a list of interruption events with context about topics being discussed.
     """
     interruptions = []
+    # Shared by every interruption of this activity (read-only downstream)
+    topics_discussed = tuple(zaak.label for zaak in activity_zaken)
     
     # Track speaker sequence within draadboekfragments
     speaker_sequence = []
     fragment_count = 0
+
+    # Distinct activity personen in first-seen order, and per speaker name the
+    # first of them it matches – names recur across the activity's fragments
+    candidates: Dict[str, Persoon] = {}
+    for speaker_info in activity_speakers:
+        candidates.setdefault(speaker_info.persoon.id, speaker_info.persoon)
+    candidate_names = _NameCandidates(list(candidates.values()))
+    speaker_matches: Dict[Tuple[str, str], Optional[Persoon]] = {}
     
-    for frag in xml_act.findall(".//vlos:draadboekfragment", NS):
-        tekst_el = frag.find("vlos:tekst", NS)
+    for frag in xml_act.iter(VLOS_DRAADBOEKFRAGMENT):
+        tekst_el = next(frag.iterchildren(VLOS_TEKST), None)
         if tekst_el is None:
             continue
             
@@ -397,30 +977,24 @@ def detect_interruptions_in_activity(xml_act: ET.Element, activity_speakers: Lis
         
         # Get all speakers in this fragment
         fragment_speakers = []
-        for sprek_el in frag.findall("vlos:sprekers/vlos:spreker", NS):
-            v_first = sprek_el.findtext("vlos:voornaam", default="", namespaces=NS)
-            v_last = (
-                sprek_el.findtext("vlos:verslagnaam", default="", namespaces=NS)
-                or sprek_el.findtext("vlos:achternaam", default="", namespaces=NS)
-            )
+        for sprek_el in _XP_SPREKERS(frag):
+            v_first, v_last = speaker_name(sprek_el)
             
             if v_last:
                 # Find matching persoon from activity speakers
-                matched_persoon = None
-                for speaker_info in activity_speakers:
-                    if (speaker_info['persoon'].achternaam.lower() == v_last.lower() or
-                        calc_name_similarity(v_first, v_last, speaker_info['persoon']) >= 60):
-                        matched_persoon = speaker_info['persoon']
-                        break
+                key = (v_first, v_last)
+                if key not in speaker_matches:
+                    speaker_matches[key] = _first_persoon_match(v_first, v_last, candidate_names)
+                matched_persoon = speaker_matches[key]
                 
-                speaker_entry = {
-                    'fragment_id': fragment_count,
-                    'persoon': matched_persoon,
-                    'name': f"{v_first} {v_last}",
-                    'persoon_id': matched_persoon.id if matched_persoon else None,
-                    'speech_text': speech_text[:200],
-                    'speech_length': len(speech_text)
-                }
+                speaker_entry = SpeakerEntry(
+                    fragment_id=fragment_count,
+                    persoon=matched_persoon,
+                    name=f"{v_first} {v_last}",
+                    persoon_id=matched_persoon.id if matched_persoon else None,
+                    speech_text=speech_text[:200],
+                    speech_length=len(speech_text),
+                )
                 fragment_speakers.append(speaker_entry)
                 speaker_sequence.append(speaker_entry)
         
@@ -434,46 +1008,56 @@ def detect_interruptions_in_activity(xml_act: ET.Element, activity_speakers: Lis
                     'fragment_id': fragment_count,
                     'context': f"Multiple speakers in fragment {fragment_count}",
                     'speech_context': speech_text[:150],
-                    'topics_discussed': [zaak['label'] for zaak in activity_zaken]
+                    'topics_discussed': topics_discussed
                 }
                 interruptions.append(interruption)
     
     # Analyze speaker sequence across fragments for interruption patterns
     if len(speaker_sequence) >= 3:
-        for i in range(1, len(speaker_sequence) - 1):
+        # Persoon ids as small ints (-1 for unmatched speakers) so the window
+        # checks over (prev, current, next) run as whole-array comparisons
+        codes: Dict[str, int] = {}
+        ids = np.fromiter(
+            (codes.setdefault(e.persoon_id, len(codes)) if e.persoon_id else -1
+             for e in speaker_sequence),
+            dtype=np.int64,
+            count=len(speaker_sequence),
+        )
+        prev_ids, cur_ids, next_ids = ids[:-2], ids[1:-1], ids[2:]
+        # Pattern: A speaks, B interrupts (A responds when next == prev)
+        switched = (prev_ids >= 0) & (cur_ids >= 0) & (prev_ids != cur_ids)
+        responded = next_ids == prev_ids
+
+        for i in (np.flatnonzero(switched) + 1).tolist():
             current = speaker_sequence[i]
             prev_speaker = speaker_sequence[i-1]
-            next_speaker = speaker_sequence[i+1] if i+1 < len(speaker_sequence) else None
-            
-            # Pattern: A speaks, B interrupts, A responds
-            if (prev_speaker['persoon_id'] and current['persoon_id'] and 
-                prev_speaker['persoon_id'] != current['persoon_id']):
-                
-                # Check if previous speaker returns (indicating a response to interruption)
-                if (next_speaker and next_speaker['persoon_id'] == prev_speaker['persoon_id']):
-                    interruption = {
-                        'type': 'interruption_with_response',
-                        'original_speaker': prev_speaker,
-                        'interrupting_speaker': current,
-                        'responding_speaker': next_speaker,
-                        'sequence_position': i,
-                        'context': f"{prev_speaker['name']} interrupted by {current['name']}, then responds",
-                        'topics_discussed': [zaak['label'] for zaak in activity_zaken],
-                        'interruption_length': current['speech_length']
-                    }
-                    interruptions.append(interruption)
-                else:
-                    # Simple interruption without clear response
-                    interruption = {
-                        'type': 'simple_interruption',
-                        'original_speaker': prev_speaker,
-                        'interrupting_speaker': current,
-                        'sequence_position': i,
-                        'context': f"{prev_speaker['name']} interrupted by {current['name']}",
-                        'topics_discussed': [zaak['label'] for zaak in activity_zaken],
-                        'interruption_length': current['speech_length']
-                    }
-                    interruptions.append(interruption)
+            next_speaker = speaker_sequence[i+1]
+
+            # Check if previous speaker returns (indicating a response to interruption)
+            if responded[i-1]:
+                interruption = {
+                    'type': 'interruption_with_response',
+                    'original_speaker': prev_speaker,
+                    'interrupting_speaker': current,
+                    'responding_speaker': next_speaker,
+                    'sequence_position': i,
+                    'context': f"{prev_speaker.name} interrupted by {current.name}, then responds",
+                    'topics_discussed': topics_discussed,
+                    'interruption_length': current.speech_length
+                }
+                interruptions.append(interruption)
+            else:
+                # Simple interruption without clear response
+                interruption = {
+                    'type': 'simple_interruption',
+                    'original_speaker': prev_speaker,
+                    'interrupting_speaker': current,
+                    'sequence_position': i,
+                    'context': f"{prev_speaker.name} interrupted by {current.name}",
+                    'topics_discussed': topics_discussed,
+                    'interruption_length': current.speech_length
+                }
+                interruptions.append(interruption)
     
     return interruptions
 
@@ -488,9 +1072,9 @@ def analyze_interruption_patterns(all_interruptions: List[dict]) -> dict:
     # Who interrupts whom most
     interruption_pairs = {}
     for interruption in all_interruptions:
-        if interruption['interrupting_speaker']['persoon_id'] and interruption['original_speaker']['persoon_id']:
-            interrupter = interruption['interrupting_speaker']['name']
-            interrupted = interruption['original_speaker']['name']
+        if interruption['interrupting_speaker'].persoon_id and interruption['original_speaker'].persoon_id:
+            interrupter = interruption['interrupting_speaker'].name
+            interrupted = interruption['original_speaker'].name
             pair_key = f"{interrupter} → {interrupted}"
             
             if pair_key not in interruption_pairs:
@@ -498,36 +1082,29 @@ def analyze_interruption_patterns(all_interruptions: List[dict]) -> dict:
                     'count': 0,
                     'interrupter': interrupter,
                     'interrupted': interrupted,
-                    'topics': set(),
+                    'topics': [],  # deduplicated once, below
                     'examples': []
                 }
             
             interruption_pairs[pair_key]['count'] += 1
-            interruption_pairs[pair_key]['topics'].update(interruption['topics_discussed'])
+            interruption_pairs[pair_key]['topics'].extend(interruption['topics_discussed'])
             interruption_pairs[pair_key]['examples'].append(interruption)
     
     # Most frequent interrupters
-    interrupter_counts = {}
-    interrupted_counts = {}
+    interrupter_counts = Counter()
+    interrupted_counts = Counter()
     
     for interruption in all_interruptions:
-        if interruption['interrupting_speaker']['persoon_id']:
-            interrupter = interruption['interrupting_speaker']['name']
-            interrupter_counts[interrupter] = interrupter_counts.get(interrupter, 0) + 1
+        if interruption['interrupting_speaker'].persoon_id:
+            interrupter_counts[interruption['interrupting_speaker'].name] += 1
         
-        if interruption['original_speaker']['persoon_id']:
-            interrupted = interruption['original_speaker']['name']
-            interrupted_counts[interrupted] = interrupted_counts.get(interrupted, 0) + 1
+        if interruption['original_speaker'].persoon_id:
+            interrupted_counts[interruption['original_speaker'].name] += 1
     
     # Topics that generate most interruptions
-    topic_interruption_counts = {}
+    topic_interruption_counts = defaultdict(lambda: {'count': 0, 'interruption_events': []})
     for interruption in all_interruptions:
         for topic in interruption['topics_discussed']:
-            if topic not in topic_interruption_counts:
-                topic_interruption_counts[topic] = {
-                    'count': 0,
-                    'interruption_events': []
-                }
             topic_interruption_counts[topic]['count'] += 1
             topic_interruption_counts[topic]['interruption_events'].append(interruption)
     
@@ -535,8 +1112,8 @@ def analyze_interruption_patterns(all_interruptions: List[dict]) -> dict:
     response_patterns = {}
     for interruption in all_interruptions:
         if interruption['type'] == 'interruption_with_response':
-            responder = interruption['responding_speaker']['name']
-            interrupter = interruption['interrupting_speaker']['name']
+            responder = interruption['responding_speaker'].name
+            interrupter = interruption['interrupting_speaker'].name
             response_key = f"{responder} responds to {interrupter}"
             
             if response_key not in response_patterns:
@@ -544,17 +1121,22 @@ def analyze_interruption_patterns(all_interruptions: List[dict]) -> dict:
                     'count': 0,
                     'responder': responder,
                     'interrupter': interrupter,
-                    'topics': set()
+                    'topics': []  # deduplicated once, below
                 }
             
             response_patterns[response_key]['count'] += 1
-            response_patterns[response_key]['topics'].update(interruption['topics_discussed'])
+            response_patterns[response_key]['topics'].extend(interruption['topics_discussed'])
+    
+    # Topic lists repeat the same activity topics many times over; keep each
+    # topic once, in first-seen order
+    for pattern in itertools.chain(interruption_pairs.values(), response_patterns.values()):
+        pattern['topics'] = list(dict.fromkeys(pattern['topics']))
     
     return {
         'total_interruptions': len(all_interruptions),
         'interruption_pairs': dict(sorted(interruption_pairs.items(), key=lambda x: x[1]['count'], reverse=True)),
-        'most_frequent_interrupters': dict(sorted(interrupter_counts.items(), key=lambda x: x[1], reverse=True)),
-        'most_interrupted_speakers': dict(sorted(interrupted_counts.items(), key=lambda x: x[1], reverse=True)),
+        'most_frequent_interrupters': dict(interrupter_counts.most_common()),
+        'most_interrupted_speakers': dict(interrupted_counts.most_common()),
         'topics_causing_interruptions': dict(sorted(topic_interruption_counts.items(), key=lambda x: x[1]['count'], reverse=True)),
         'response_patterns': dict(sorted(response_patterns.items(), key=lambda x: x[1]['count'], reverse=True)),
         'interruption_types': {
@@ -571,64 +1153,135 @@ try:
     from test_vlos_speaker_quote_matching import (
         FUZZY_FIRSTNAME_THRESHOLD,
         FUZZY_SURNAME_THRESHOLD,
-        calc_name_similarity as _orig_calc_name_similarity,  # ignored (overridden)
-        find_best_persoon as _generic_find_best_persoon,
         collapse_text,
     )
 except ModuleNotFoundError:
     from tests.test_vlos_speaker_quote_matching import (
         FUZZY_FIRSTNAME_THRESHOLD,
         FUZZY_SURNAME_THRESHOLD,
-        calc_name_similarity as _orig_calc_name_similarity,  # ignored (overridden)
-        find_best_persoon as _generic_find_best_persoon,
         collapse_text,
     )
 
 
+def _persoon_key(first: str, last: str) -> Tuple[str, str]:
+    """Persoon cache key – resolution is case-insensitive, so capitalisation
+    variants of a name share one entry."""
+    return (first or "").lower(), (last or "").lower()
+
+
 def find_best_persoon(api: TKApi, first: str, last: str) -> Optional[Persoon]:
     """Thin wrapper so we can call the shared helper with local name."""
-    # First try the generic exact-achternaam search (fast cache-friendly)
-    res = _generic_find_best_persoon(api, first, last)
-    if res:
-        return res
+    key = _persoon_key(first, last)
+    if key not in _PERSOON_CACHE:
+        _PERSOON_CACHE[key] = _persoon_index(api).find_best(first, last)
+    return _PERSOON_CACHE[key]
 
-    # Fallback: search by *contains* main surname token (last word of v_last)
-    if not last:
-        return None
 
-    main_last_token = last.strip().split()[-1]
-    pf = Persoon.create_filter()
-    safe_last = main_last_token.replace("'", "''")
-    pf.add_filter_str(f"contains(tolower(Achternaam), '{safe_last.lower()}')")
+def _actor_candidates(actors) -> _NameCandidates:
+    """The actors' Personen, ready to score many speaker names against."""
+    return _NameCandidates([p for p in (getattr(a, "persoon", None) for a in actors or []) if p])
 
-    candidates = api.get_items(Persoon, filter=pf, max_items=100)
-    if not candidates:
-        return None
 
-    best_p = None
-    best_sc = 0
-    for p in candidates:
-        s = calc_name_similarity(first, last, p)
-        if s > best_sc:
-            best_sc = s
-            best_p = p
+def best_persoon_from_actors(first: str, last: str, actors) -> Optional[Persoon]:
+    """Pick the actor.persoon with highest similarity ≥60; None if no good hit.
 
-    return best_p if best_sc >= 60 else None
+    *actors* may also be a prebuilt :func:`_actor_candidates` result.
+    """
+    if not isinstance(actors, _NameCandidates):
+        actors = _actor_candidates(actors)
+    return _pick_best_persoon(first, last, actors)
 
 
-def best_persoon_from_actors(first: str, last: str, actors) -> Optional[Persoon]:
-    """Pick the actor.persoon with highest similarity ≥60; None if no good hit."""
-    best: Optional[Persoon] = None
-    best_score = 0
-    for a in actors or []:
-        p = getattr(a, "persoon", None)
-        if not p:
+class _PersoonIndex:
+    """In-memory surname index over the full Persoon roster.
+
+    Answers the two lookups the generic helper sends to the TK-API –
+    ``Achternaam eq`` and ``contains(tolower(Achternaam), token)``, each
+    capped at 100 hits – without a request per speaker.  The roster keeps
+    the API's default GewijzigdOp ordering, so every bucket does too.
+
+    The surname match is case-insensitive and all scoring lowercases, so a
+    name resolves the same in any capitalisation.
+    """
+
+    def __init__(self, personen: List[Persoon]):
+        self.by_surname: Dict[str, List[Persoon]] = defaultdict(list)
+        self._lowered: List[Tuple[str, Persoon]] = []
+        for p in personen:
+            if not p.achternaam:
+                continue
+            ach_lower = p.achternaam.lower()
+            self.by_surname[ach_lower].append(p)
+            self._lowered.append((ach_lower, p))
+
+    def containing(self, token: str, max_items: int = 100) -> List[Persoon]:
+        hits = []
+        for ach_lower, p in self._lowered:
+            if token in ach_lower:
+                hits.append(p)
+                if len(hits) == max_items:
+                    break
+        return hits
+
+    def find_best(self, first: str, last: str) -> Optional[Persoon]:
+        if not (last and last.strip()):
+            return None
+
+        # First the generic exact-achternaam pick
+        exact = self.by_surname.get(last.lower(), [])[:100]
+        if exact:
+            return _pick_exact_surname(first, exact)
+
+        # Fallback: surnames *containing* the main surname token (last word of v_last)
+        main_last_token = last.strip().split()[-1].lower()
+        return _pick_best_persoon(first, last, self.containing(main_last_token))
+
+
+def _pick_exact_surname(v_first: str, personen: List[Persoon]) -> Persoon:
+    """Best of *personen* that all match the speaker surname exactly.
+
+    Mirrors the shared ``calc_name_similarity`` (60 for the surname plus the
+    roepnaam/voornaam boost), so every candidate clears the 60 threshold and
+    only the first-name ratios – scored in one batched call – decide.
+    """
+    v_first_lower = (v_first or "").lower()
+    if not v_first_lower:
+        return personen[0]
+    n = len(personen)
+    first_names = [(getattr(p, "roepnaam", None) or "").lower() for p in personen]
+    first_names += [(getattr(p, "voornaam", None) or "").lower() for p in personen]
+    first_row = _cdist_row(v_first_lower, first_names, FIRSTNAME_RATIO_CUTOFF)
+    scores = _name_scores_np(True, 0, np.maximum(first_row[:n], first_row[n:]))
+    return personen[int(np.argmax(scores))]
+
+
+_PERSOON_INDEX: Optional[_PersoonIndex] = None
+_PERSOON_INDEX_LOCK = threading.Lock()
+
+
+def _persoon_index(api: TKApi) -> _PersoonIndex:
+    """Download the Persoon roster once per session and index it."""
+    global _PERSOON_INDEX
+    with _PERSOON_INDEX_LOCK:
+        if _PERSOON_INDEX is None:
+            _PERSOON_INDEX = _PersoonIndex(api.get_items(Persoon))
+        return _PERSOON_INDEX
+
+
+def prefetch_personen(api: TKApi, names: Iterable[Tuple[str, str]]) -> None:
+    """Resolve many (first, last) speaker names against the roster index.
+
+    Stores in the persoon cache exactly what :func:`find_best_persoon` would
+    return for each name.
+    """
+    index = None
+    for first, last in names:
+        key = _persoon_key(first, last)
+        if key in _PERSOON_CACHE:
             continue
-        s = calc_name_similarity(first, last, p)
-        if s > best_score:
-            best_score = s
-            best = p
-    return best if best_score >= 60 else None
+        if index is None:
+            index = _persoon_index(api)
+        _PERSOON_CACHE[key] = index.find_best(first, last)
 
 # ---------------------------------------------------------------------------
 # Configuration (copied / aligned with tests/test.py)
@@ -652,6 +1305,17 @@ MIN_MATCH_SCORE_FOR_ACTIVITEIT = 3.0  # lower threshold so time + soort alone ca
 TIME_START_PROXIMITY_TOLERANCE_SECONDS = 300  # 5 minutes
 TIME_GENERAL_OVERLAP_BUFFER_SECONDS = 600     # 10 minutes
 
+# Set VLOS_DEBUG=1 to list the best-scoring candidates per XML activiteit
+VLOS_DEBUG = bool(os.getenv('VLOS_DEBUG'))
+VLOS_DEBUG_TOP_N = 5
+# Set VLOS_VERBOSE=1 to also report every speaker, zaak and zaak speaker link,
+# the full label lists and the detailed examples (always on when run as a script)
+VLOS_VERBOSE = bool(os.getenv('VLOS_VERBOSE')) or __name__ == '__main__'
+
+# Section rules for the report, built once
+REPORT_BAR = '=' * 80
+REPORT_SEP = '\n' + REPORT_BAR
+
 FUZZY_SIMILARITY_THRESHOLD_HIGH = 85  # was 90 – slightly looser
 FUZZY_SIMILARITY_THRESHOLD_MEDIUM = 70  # slightly looser medium fuzzy cut-off
 
@@ -688,19 +1352,36 @@ COMMON_TOPIC_PREFIXES = [
     'e-mailprocedure',
 ]
 
-_PREFIX_REGEX = re.compile(r'^(' + '|'.join(re.escape(p) for p in COMMON_TOPIC_PREFIXES) + r')[\s:,-]+', re.IGNORECASE)
+# Literal prefixes in list order (first listed wins, like the former regex
+# alternation), plus their first characters for a cheap "no prefix" exit
+_PREFIX_TUPLE = tuple(dict.fromkeys(COMMON_TOPIC_PREFIXES))
+_PREFIX_FIRST_CHARS = frozenset(p[0] for p in _PREFIX_TUPLE)
+_PREFIX_SEPARATORS = ':,-'
+
+
+def _strip_topic_prefix(text: str) -> str:
+    """Remove one leading boilerplate prefix that is followed by a separator."""
+    if not text or text[0] not in _PREFIX_FIRST_CHARS:
+        return text
+    for prefix in _PREFIX_TUPLE:
+        n = len(prefix)
+        if text.startswith(prefix) and len(text) > n and (text[n].isspace() or text[n] in _PREFIX_SEPARATORS):
+            while n < len(text) and (text[n].isspace() or text[n] in _PREFIX_SEPARATORS):
+                n += 1
+            return text[n:]
+    return text
 
 
+@lru_cache(maxsize=4096)
 def normalize_topic(text: str) -> str:
     """Lower-case, strip, and remove common boilerplate prefixes for fair fuzzy matching."""
     if not text:
         return ''
     text = text.strip().lower()
     # remove prefix once
-    text = _PREFIX_REGEX.sub('', text, count=1)
+    text = _strip_topic_prefix(text)
     # collapse whitespace
-    text = re.sub(r'\s+', ' ', text)
-    return text
+    return ' '.join(text.split())
 
 # Slightly boost high-fuzzy rewards
 SCORE_ONDERWERP_FUZZY_HIGH     = 2.5  # was 3.0? adjust for new scale (if earlier 3 stays fine, keep)
@@ -719,8 +1400,98 @@ SOORT_ALIAS = {
     ],
 }
 
+
+@lru_cache(maxsize=4096)
+def soort_match(xml_s: str, api_s: str) -> Tuple[float, Optional[str]]:
+    """Score + reason for two lower-cased soorten (there are only a handful of distinct pairs)."""
+    if not (xml_s and api_s):
+        return 0.0, None
+    if xml_s == api_s:
+        return SCORE_SOORT_EXACT, "Soort exact match"
+    if xml_s in api_s:
+        return SCORE_SOORT_PARTIAL_XML_IN_API, "Soort partial XML in API"
+    if api_s in xml_s:
+        return SCORE_SOORT_PARTIAL_API_IN_XML, "Soort partial API in XML"
+    # Alias check: if any alias of xml_s appears in api_s
+    for alias in SOORT_ALIAS.get(xml_s, ()):
+        if alias in api_s:
+            return SCORE_SOORT_PARTIAL_XML_IN_API, f"Soort alias match ('{alias}')"
+    return 0.0, None
+
 NS = {'vlos': 'http://www.tweedekamer.nl/ggm/vergaderverslag/v1.0'}
 
+# Clark-notation tags for the hot lookups – no prefix/namespace-map resolution
+_VLOS = '{%s}' % NS['vlos']
+VLOS_VERGADERING = _VLOS + 'vergadering'
+VLOS_ACTIVITEIT = _VLOS + 'activiteit'
+VLOS_DRAADBOEKFRAGMENT = _VLOS + 'draadboekfragment'
+VLOS_ZAAK = _VLOS + 'zaak'
+VLOS_VOORNAAM = _VLOS + 'voornaam'
+VLOS_VERSLAGNAAM = _VLOS + 'verslagnaam'
+VLOS_ACHTERNAAM = _VLOS + 'achternaam'
+VLOS_AANVANGSTIJD = _VLOS + 'aanvangstijd'
+VLOS_ACTIVITEITITEM = _VLOS + 'activiteititem'
+VLOS_BESLUITVORM = _VLOS + 'besluitvorm'
+VLOS_DATUM = _VLOS + 'datum'
+VLOS_EINDTIJD = _VLOS + 'eindtijd'
+VLOS_FRACTIE = _VLOS + 'fractie'
+VLOS_MARKEERTIJDBEGIN = _VLOS + 'markeertijdbegin'
+VLOS_MARKEERTIJDEIND = _VLOS + 'markeertijdeind'
+VLOS_ONDERWERP = _VLOS + 'onderwerp'
+VLOS_STEM = _VLOS + 'stem'
+VLOS_STEMMING = _VLOS + 'stemming'
+VLOS_STEMMINGEN = _VLOS + 'stemmingen'
+VLOS_TEKST = _VLOS + 'tekst'
+VLOS_TITEL = _VLOS + 'titel'
+VLOS_UITSLAG = _VLOS + 'uitslag'
+VLOS_VERGADERINGNUMMER = _VLOS + 'vergaderingnummer'
+_SPEAKER_NAME_TAGS = frozenset((VLOS_VOORNAAM, VLOS_VERSLAGNAAM, VLOS_ACHTERNAAM))
+_VOTING_ITEM_TAGS = frozenset((VLOS_TITEL, VLOS_BESLUITVORM, VLOS_UITSLAG))
+_STEMMING_TAGS = frozenset((VLOS_FRACTIE, VLOS_STEM))
+
+# Pre-compiled XPath for the per-zaak field reads; string() gives
+# '' for a missing child like findtext(default=""), and plain (non-smart)
+# strings keep no reference back into the tree.
+_XP_SPREKERS = ET.XPath('vlos:sprekers/vlos:spreker', namespaces=NS)
+_XP_ACT_SPREKERS = ET.XPath('.//vlos:draadboekfragment/vlos:sprekers/vlos:spreker', namespaces=NS)
+# Reference numbers come back whitespace-normalised, i.e. already stripped
+_XP_DOSSIERNUMMER = ET.XPath('normalize-space(vlos:dossiernummer)', namespaces=NS, smart_strings=False)
+_XP_STUKNUMMER = ET.XPath('normalize-space(vlos:stuknummer)', namespaces=NS, smart_strings=False)
+_XP_TITEL = ET.XPath('string(vlos:titel)', namespaces=NS, smart_strings=False)
+
+# Voting activiteititems (@soort compared case-insensitively), selected in one
+# native call instead of testing every item's soort from Python
+_SOORT_LOWER = "translate(@soort, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+_XP_VOTING_ITEMS = ET.XPath(
+    './/vlos:activiteititem[%s]' % ' or '.join(
+        f"{_SOORT_LOWER} = '{soort}'" for soort in ('besluit', 'stemming', 'vote')
+    ),
+    namespaces=NS,
+)
+
+
+def _child_texts(el, tags: frozenset) -> Dict[str, str]:
+    """{tag: text} for the children of *el* with one of *tags*.
+
+    One pass over the children instead of a findtext per field; the first
+    occurrence of each tag wins and a missing text reads as "", as with
+    findtext.  Tags without a child are absent from the result.
+    """
+    texts = {}
+    for child in el:
+        if child.tag in tags and child.tag not in texts:
+            texts[child.tag] = child.text or ""
+    return texts
+
+
+def speaker_name(sprek_el) -> Tuple[str, str]:
+    """(voornaam, verslagnaam or achternaam) of a <spreker> element."""
+    names = _child_texts(sprek_el, _SPEAKER_NAME_TAGS)
+    return (
+        names.get(VLOS_VOORNAAM, ""),
+        names.get(VLOS_VERSLAGNAAM, "") or names.get(VLOS_ACHTERNAAM, ""),
+    )
+
 # ---------------------------------------------------------------------------
 # Helper functions (trimmed version of tests/test.py helpers)
 # ---------------------------------------------------------------------------
@@ -744,914 +1515,1193 @@ def parse_xml_datetime(datetime_val):
             return None
 
 
+_LOCAL_DELTA = timedelta(hours=LOCAL_TIMEZONE_OFFSET_HOURS)
+
+
 def get_utc_datetime(dt_obj, local_offset_hours):
     if not dt_obj:
         return None
     if dt_obj.tzinfo is None or dt_obj.tzinfo.utcoffset(dt_obj) is None:
-        return (dt_obj - timedelta(hours=local_offset_hours)).replace(tzinfo=timezone.utc)
+        delta = _LOCAL_DELTA if local_offset_hours == LOCAL_TIMEZONE_OFFSET_HOURS else timedelta(hours=local_offset_hours)
+        return (dt_obj - delta).replace(tzinfo=timezone.utc)
     return dt_obj.astimezone(timezone.utc)
 
 
-def evaluate_time_match(xml_start, xml_end, api_start, api_end):
-    score = 0.0
-    reason = 'No significant time match'
-    if not (xml_start and api_start and api_end):
-        return score, reason
+# Time matching on integer epoch microseconds comes from the activity-matching
+# test, so all VLOS tests share one kernel
+try:
+    from test_vlos_activity_matching import (
+        TIME_MATCH_RESULTS,
+        TIME_MATCH_SCORES,
+        epoch_us,
+        get_vergaderingen_with_verslag,
+        time_match_codes,
+    )
+except ModuleNotFoundError:
+    from tests.test_vlos_activity_matching import (
+        TIME_MATCH_RESULTS,
+        TIME_MATCH_SCORES,
+        epoch_us,
+        get_vergaderingen_with_verslag,
+        time_match_codes,
+    )
+
+
+@lru_cache(maxsize=4096)
+def xml_time_us(datetime_val: Optional[str]) -> Optional[int]:
+    """UTC epoch microseconds for a VLOS time string, or None if absent/unparseable.
+
+    Begin/eind markers repeat across activiteiten and files, so the
+    parse + UTC conversion runs once per distinct string.
+    """
+    return epoch_us(get_utc_datetime(parse_xml_datetime(datetime_val), LOCAL_TIMEZONE_OFFSET_HOURS))
+
+
+def _topic_scores(exact: np.ndarray, ratios: np.ndarray, exact_score: float,
+                  high_score: float, medium_score: float) -> np.ndarray:
+    """Per-candidate topic reward: exact beats fuzzy high beats fuzzy medium."""
+    return np.where(
+        exact,
+        exact_score,
+        np.where(
+            ratios >= FUZZY_SIMILARITY_THRESHOLD_HIGH,
+            high_score,
+            np.where(ratios >= FUZZY_SIMILARITY_THRESHOLD_MEDIUM, medium_score, 0.0),
+        ),
+    )
+
 
-    xml_start_utc = get_utc_datetime(xml_start, LOCAL_TIMEZONE_OFFSET_HOURS)
-    api_start_utc = get_utc_datetime(api_start, LOCAL_TIMEZONE_OFFSET_HOURS)
-    api_end_utc = get_utc_datetime(api_end, LOCAL_TIMEZONE_OFFSET_HOURS)
+def _topic_reason(label: str, exact_reason: str, exact: bool, ratio: int) -> str:
+    if exact:
+        return exact_reason
+    tier = 'high' if ratio >= FUZZY_SIMILARITY_THRESHOLD_HIGH else 'medium'
+    return f"{label} fuzzy {tier} ({ratio}%)"
 
-    xml_end_eff = xml_end or (xml_start + timedelta(minutes=1))
-    xml_end_utc = get_utc_datetime(xml_end_eff, LOCAL_TIMEZONE_OFFSET_HOURS)
 
-    if not (xml_start_utc and api_start_utc and api_end_utc and xml_end_utc):
-        return score, 'Missing converted UTC data'
+def score_candidates(partial: np.ndarray, has_ond: np.ndarray, norm_onds: List[str], xml_ond: str,
+                     xml_tit: str, norm_xml_ond: str, norm_xml_tit: str, prune: bool = True):
+    """Full match scores for one XML activiteit against every candidate.
 
-    start_close = abs((xml_start_utc - api_start_utc).total_seconds()) <= TIME_START_PROXIMITY_TOLERANCE_SECONDS
-    overlap = max(xml_start_utc, api_start_utc - timedelta(seconds=TIME_GENERAL_OVERLAP_BUFFER_SECONDS)) < \
-              min(xml_end_utc, api_end_utc + timedelta(seconds=TIME_GENERAL_OVERLAP_BUFFER_SECONDS))
+    *partial* holds the time + soort score per candidate, *has_ond* whether it
+    has an onderwerp at all and *norm_onds* the normalised onderwerpen. The runner-up
+    ends up scoring at least the second-highest partial, so with *prune* a
+    candidate whose partial plus maximum topic reward stays below that can be
+    neither best nor runner-up and is skipped before the onderwerp/titel fuzzing.
 
-    if start_close:
-        score = SCORE_TIME_START_PROXIMITY
-        reason = 'Start times close'
-        if overlap:
-            reason += ' & overlap'
-    elif overlap:
-        score = SCORE_TIME_OVERLAP_ONLY
-        reason = 'Timeframes overlap'
-    return score, reason
+    Returns ``(survivors, scores, ond_exact, ond_ratios, tit_exact, tit_ratios)``,
+    all aligned with the surviving candidate indices.
+    """
+    topic_max = 0.0
+    if xml_ond:
+        topic_max += max(SCORE_ONDERWERP_EXACT, SCORE_ONDERWERP_FUZZY_HIGH, SCORE_ONDERWERP_FUZZY_MEDIUM)
+    if xml_tit:
+        topic_max += max(
+            SCORE_TITEL_EXACT_VS_API_ONDERWERP,
+            SCORE_TITEL_FUZZY_HIGH_VS_API_ONDERWERP,
+            SCORE_TITEL_FUZZY_MEDIUM_VS_API_ONDERWERP,
+        )
+    if prune and partial.size > 1:
+        prune_below = np.partition(partial, -2)[-2]
+        survivors = np.flatnonzero(partial + np.where(has_ond, topic_max, 0.0) >= prune_below)
+    else:
+        survivors = np.arange(partial.size)
+
+    # Topics equal to the XML text (scored as exact) or whose length alone rules
+    # out a medium fuzzy hit are left at ratio 0.
+    surv_onds = [norm_onds[idx] for idx in survivors.tolist()]
+    ond_ratios = np.zeros(len(surv_onds), dtype=np.int64)
+    tit_ratios = np.zeros(len(surv_onds), dtype=np.int64)
+    fuzz_pos = [
+        pos for pos, norm_api_ond in enumerate(surv_onds)
+        if _needs_ratio(norm_xml_ond, norm_api_ond, FUZZY_SIMILARITY_THRESHOLD_MEDIUM)
+        or _needs_ratio(norm_xml_tit, norm_api_ond, FUZZY_SIMILARITY_THRESHOLD_MEDIUM)
+    ]
+    if fuzz_pos:
+        ond_row, tit_row = _cdist_ratios(
+            [norm_xml_ond, norm_xml_tit],
+            [surv_onds[pos] for pos in fuzz_pos],
+            FUZZY_SIMILARITY_THRESHOLD_MEDIUM,
+        )
+        ond_ratios[fuzz_pos] = ond_row
+        tit_ratios[fuzz_pos] = tit_row
+
+    surv_has_ond = has_ond[survivors]
+    ond_exact = np.fromiter((o == norm_xml_ond for o in surv_onds), dtype=bool, count=len(surv_onds))
+    tit_exact = np.fromiter((o == norm_xml_tit for o in surv_onds), dtype=bool, count=len(surv_onds))
+    scores = partial[survivors]
+    if xml_ond:
+        scores = scores + np.where(surv_has_ond, _topic_scores(
+            ond_exact, ond_ratios,
+            SCORE_ONDERWERP_EXACT, SCORE_ONDERWERP_FUZZY_HIGH, SCORE_ONDERWERP_FUZZY_MEDIUM,
+        ), 0.0)
+    if xml_tit:
+        scores = scores + np.where(surv_has_ond, _topic_scores(
+            tit_exact, tit_ratios,
+            SCORE_TITEL_EXACT_VS_API_ONDERWERP,
+            SCORE_TITEL_FUZZY_HIGH_VS_API_ONDERWERP,
+            SCORE_TITEL_FUZZY_MEDIUM_VS_API_ONDERWERP,
+        ), 0.0)
+    return survivors, scores, ond_exact, ond_ratios, tit_exact, tit_ratios
 
 # ---------------------------------------------------------------------------
-# Test routine
+# Per-file processing
 # ---------------------------------------------------------------------------
 
-def test_sample_vlos_files_agendapunt_matching():
-    """Iterate over sample_vlos_*.xml files and attempt to find best API Activiteit matches.
-    
-    Enhanced version with Dossier fallback logic for Zaak matching.
-    """
-    api = TKApi(verbose=False)
+def xml_speaker_names(xml_act) -> List[Tuple[str, str]]:
+    """(voornaam, verslagnaam or achternaam) of every fragment speaker in *xml_act*."""
+    return [
+        speaker_name(sprek_el)
+        for sprek_el in _XP_ACT_SPREKERS(xml_act)
+    ]
 
-    xml_files = glob.glob('sample_vlos_*.xml')
-    assert xml_files, 'No sample_vlos_*.xml files found in repository root.'
-    # Global counters – activiteiten and speakers
-    total_xml_acts = 0
-    total_matched_acts = 0
-    total_speakers = 0
-    total_matched_speakers = 0
-
-    # Zaak counters (init before first use)
-    total_xml_zaken = 0
-    total_matched_zaken = 0
-
-    unmatched_acts = []  # collect details of unmatched activiteiten
-
-    matched_speaker_labels = []  # store unique labels for summary
-    unmatched_speaker_labels = []
-    matched_zaak_labels = []
-    unmatched_zaak_labels = []
-
-    # Dossier / Document tracking
-    total_xml_dossiers = 0
-    total_matched_dossiers = 0
-    matched_dossier_labels = []
-    unmatched_dossier_labels = []
-
-    total_xml_docs = 0
-    total_matched_docs = 0
-    matched_doc_labels = []
-    unmatched_doc_labels = []
-
-    # NEW: Speaker-Zaak connection tracking
-    speaker_zaak_connections = []  # List of (persoon, zaak/dossier, context) tuples
-    speaker_activity_map = {}      # persoon_id -> list of activities they spoke in
-    zaak_activity_map = {}         # zaak_id -> list of activities it was discussed in
-    activity_speakers = {}         # activity_id -> list of speakers
-    activity_zaken = {}            # activity_id -> list of zaken/dossiers
-
-    # NEW: Interruption tracking
-    all_interruptions = []         # List of all interruption events across activities
-
-    # NEW: Voting tracking
-    all_voting_events = []         # List of all voting events across activities
-
-    for xml_path in xml_files:
-        print('\n' + '=' * 80)
-        print(f'Processing XML file: {xml_path}')
-
-        with open(xml_path, 'r', encoding='utf-8') as fh:
-            xml_data = fh.read()
-        root = ET.fromstring(xml_data)
-        vergadering_el = root.find('vlos:vergadering', NS)
-        assert vergadering_el is not None, 'XML lacks <vergadering> element.'
-
-        # Extract basic vergadering info
-        xml_soort = vergadering_el.get('soort', '')
-        xml_titel = vergadering_el.findtext('vlos:titel', default='', namespaces=NS)
-        xml_nummer = vergadering_el.findtext('vlos:vergaderingnummer', default='', namespaces=NS)
-        xml_date_str = vergadering_el.findtext('vlos:datum', default='', namespaces=NS)
-        assert xml_date_str, 'XML vergadering missing <datum>'
-
-        target_date = datetime.strptime(xml_date_str.split('T')[0], '%Y-%m-%d')
-        utc_start = target_date - timedelta(hours=LOCAL_TIMEZONE_OFFSET_HOURS)
-        utc_end = target_date + timedelta(days=1) - timedelta(hours=LOCAL_TIMEZONE_OFFSET_HOURS)
-
-        v_filter = Vergadering.create_filter()
-        v_filter.filter_date_range(begin_datetime=utc_start, end_datetime=utc_end)
-        if xml_soort:
-            if xml_soort.lower() == 'plenair':
-                v_filter.filter_soort(VergaderingSoort.PLENAIR)
-            elif xml_soort.lower() == 'commissie':
-                v_filter.filter_soort(VergaderingSoort.COMMISSIE)
-            else:
-                v_filter.filter_soort(xml_soort)
-        if xml_nummer:
-            try:
-                v_filter.add_filter_str(f'VergaderingNummer eq {int(xml_nummer)}')
-            except ValueError:
-                pass
-
-        Vergadering.expand_params = ['Verslag']
-        vergaderingen = api.get_items(Vergadering, filter=v_filter, max_items=5)
-        Vergadering.expand_params = None
-        assert vergaderingen, 'No TKApi Vergadering found for XML file.'
-        canonical_verg = vergaderingen[0]
-        print(f'Canonical Vergadering chosen: {canonical_verg.id} ({canonical_verg.titel})')
-
-        # Fetch activiteiten in timeframe (reuse earlier logic)
-        act_filter = Activiteit.create_filter()
-        time_buffer = timedelta(minutes=60)  # wider buffer (±1 hour)
-
-        # Convert to UTC before sending to TK-API – avoids paging out morning items
-        start_utc = (canonical_verg.begin - time_buffer).astimezone(timezone.utc)
-        end_utc = (canonical_verg.einde + time_buffer).astimezone(timezone.utc)
-
-        act_filter.filter_date_range(
-            begin_datetime=start_utc,
-            end_datetime=end_utc,
-        )
-        candidate_acts = api.get_items(Activiteit, filter=act_filter, max_items=200)
 
-        # Drop Agendapunt import – we focus on Activiteit matching
+def xml_zaak_refs(xml_act) -> List[Tuple[str, str]]:
+    """(dossiernummer, stuknummer) of every zaak referenced in *xml_act*."""
+    return [
+        (_XP_DOSSIERNUMMER(xml_zaak), _XP_STUKNUMMER(xml_zaak))
+        for xml_zaak in xml_act.iter(VLOS_ZAAK)
+    ]
 
-        print(f'Fetched {len(candidate_acts)} candidate API activiteiten')
 
-        # ------------------------------------------------------------------
-        # Match each top-level XML <activiteit> directly to API Activiteit
-        # ------------------------------------------------------------------
-        file_xml_count = 0
-        file_match_count = 0
+def prefetch_files(api: TKApi, xml_paths: Iterable[str]) -> None:
+    """Warm the persoon and zaak caches for several VLOS files in one round.
 
-        for xml_act in vergadering_el.findall('vlos:activiteit', NS):
-            xml_soort = xml_act.get('soort', '').lower()
-            xml_titel = xml_act.findtext('vlos:titel', default='', namespaces=NS).lower()
-            
-            # Skip procedural activities that don't have meaningful API counterparts
-            if (xml_soort in ['opening', 'sluiting'] or 
-                'opening' in xml_titel or 'sluiting' in xml_titel):
-                print(f'  ⏭️ Skipping procedural activity: "{xml_soort}" - "{xml_titel}"')
+    Batching across files packs the OR'd $filter chunks full instead of
+    issuing a partly filled chunk per file.
+    """
+    names, refs = [], []
+    for xml_path in xml_paths:
+        # Streamed like the per-file pass: only one activiteit subtree is kept
+        # in memory; files without a <vergadering> simply yield nothing here
+        for xml_act in iter_activiteiten(xml_path):
+            names.extend(xml_speaker_names(xml_act))
+            refs.extend(xml_zaak_refs(xml_act))
+    prefetch_personen(api, names)
+    prefetch_zaak_refs(api, refs)
+
+
+@dataclass(slots=True)
+class SpeakerZaakConnection:
+    """A speaker linked to a Zaak/Dossier within one activiteit."""
+    persoon: Persoon
+    persoon_name: str
+    zaak_object: object  # Zaak, or Dossier for fallback matches
+    zaak_type: str
+    zaak_label: str
+    activity_id: str  # API ID, not VLOS xml_id
+    activity_title: str
+    context: str
+    speech_preview: str
+
+
+@dataclass
+class FileResult:
+    """Everything :func:`_process_file` collects for one VLOS XML file."""
+    xml_path: str
+    lines: List[str] = field(default_factory=list)  # buffered report output
+
+    total_xml_acts: int = 0
+    total_matched_acts: int = 0
+    total_speakers: int = 0
+    total_matched_speakers: int = 0
+    total_xml_zaken: int = 0
+    total_matched_zaken: int = 0
+    total_xml_dossiers: int = 0
+    total_matched_dossiers: int = 0
+    total_xml_docs: int = 0
+    total_matched_docs: int = 0
+
+    unmatched_acts: List[dict] = field(default_factory=list)
+    # Labels are reported de-duplicated and sorted, so most are kept as sets;
+    # the matched zaak labels stay lists because their counts include repeats
+    matched_speaker_labels: Set[str] = field(default_factory=set)
+    unmatched_speaker_labels: Set[str] = field(default_factory=set)
+    # label -> times matched; merge() sums them through Counter.update
+    direct_zaak_labels: Counter = field(default_factory=Counter)
+    fallback_zaak_labels: Counter = field(default_factory=Counter)
+    unmatched_zaak_labels: Set[str] = field(default_factory=set)
+    matched_dossier_labels: Set[str] = field(default_factory=set)
+    unmatched_dossier_labels: Set[str] = field(default_factory=set)
+    matched_doc_labels: Set[str] = field(default_factory=set)
+    unmatched_doc_labels: Set[str] = field(default_factory=set)
+
+    speaker_zaak_connections: List[SpeakerZaakConnection] = field(default_factory=list)
+    speaker_connections: Dict[str, dict] = field(default_factory=dict)  # persoon_id -> name + connections
+    zaak_connections: Dict[str, dict] = field(default_factory=dict)     # zaak_id -> label/type + speakers
+    speaker_activity_map: Dict[str, List[dict]] = field(default_factory=lambda: defaultdict(list))  # persoon_id -> activities
+    zaak_activity_map: Dict[str, List[dict]] = field(default_factory=lambda: defaultdict(list))     # zaak_id -> activities
+    activity_speakers: Dict[str, List[SpeakerInfo]] = field(default_factory=dict)  # activity_id -> speakers
+    activity_zaken: Dict[str, List[ZaakInfo]] = field(default_factory=dict)        # activity_id -> zaken/dossiers
+    all_interruptions: List[dict] = field(default_factory=list)
+    all_voting_events: List[dict] = field(default_factory=list)
+
+    def add_connection(self, conn: SpeakerZaakConnection) -> None:
+        """Record a speaker-zaak connection and update its groupings."""
+        self.speaker_zaak_connections.append(conn)
+        speaker_id = conn.persoon.id
+        zaak_id = conn.zaak_object.id
+        # get() first: setdefault() would build a throwaway group dict per connection
+        group = self.speaker_connections.get(speaker_id)
+        if group is None:
+            group = self.speaker_connections[speaker_id] = {'name': conn.persoon_name, 'connections': []}
+        group['connections'].append(conn)
+        group = self.zaak_connections.get(zaak_id)
+        if group is None:
+            group = self.zaak_connections[zaak_id] = {
+                'label': conn.zaak_label, 'type': conn.zaak_type, 'speakers': [],
+            }
+        group['speakers'].append(conn)
+
+    def merge(self, other: "FileResult") -> None:
+        """Fold another file's results into this one (call in file order)."""
+        for f in fields(self):
+            if f.name in ('xml_path', 'lines'):
                 continue
-            
-            total_xml_acts += 1
-            file_xml_count += 1
-            xml_id = xml_act.get('objectid')  # Keep for debugging, but don't use as key
-            xml_soort = xml_act.get('soort')  # Get original soort for processing
-            xml_titel = xml_act.findtext('vlos:titel', default='', namespaces=NS)  # Get original titel for processing
-            xml_onderwerp = xml_act.findtext('vlos:onderwerp', default='', namespaces=NS)
-
-            xml_start = parse_xml_datetime(
-                xml_act.findtext('vlos:aanvangstijd', default=None, namespaces=NS)
-                or xml_act.findtext('vlos:markeertijdbegin', default=None, namespaces=NS)
-            )
-            xml_end = parse_xml_datetime(
-                xml_act.findtext('vlos:eindtijd', default=None, namespaces=NS)
-                or xml_act.findtext('vlos:markeertijdeind', default=None, namespaces=NS)
-            )
+            mine, theirs = getattr(self, f.name), getattr(other, f.name)
+            if isinstance(mine, int):
+                setattr(self, f.name, mine + theirs)
+            elif f.name in ('speaker_activity_map', 'zaak_activity_map'):
+                for key, items in theirs.items():
+                    mine[key].extend(items)
+            elif f.name in ('speaker_connections', 'zaak_connections'):
+                items_key = 'connections' if f.name == 'speaker_connections' else 'speakers'
+                for key, group in theirs.items():
+                    if key in mine:
+                        mine[key][items_key].extend(group[items_key])
+                    else:
+                        mine[key] = group
+            elif isinstance(mine, (dict, set)):
+                mine.update(theirs)
+            else:
+                mine.extend(theirs)
 
-            # C) Fallback to canonical vergadering timeframe when XML lacks explicit times
-            if not xml_start:
-                xml_start = canonical_verg.begin
-            if not xml_end:
-                xml_end = canonical_verg.einde
 
-            best_match = None
-            best_score = 0.0
-            potential_matches = []  # collect (score, reasons, api_act)
+# Files are processed concurrently – the work is dominated by TK-API I/O
+MAX_FILE_WORKERS = 8
 
-            for api_act in candidate_acts:
-                score = 0.0
-                reasons = []
+# One TKApi is shared by all workers: get_items is a classmethod issuing plain
+# requests.get calls, so an instance carries no per-thread state. lxml parsers
+# are not thread-safe, though, so each thread keeps its own (_parse_vlos).
+_thread_local = threading.local()
 
-                # ------------------------ Time proximity ------------------
-                time_score, time_reason = evaluate_time_match(
-                    xml_start,
-                    xml_end,
-                    api_act.begin,
-                    api_act.einde,
-                )
-                score += time_score
-                if time_score:
-                    reasons.append(time_reason)
 
-                # ------------------------ Soort comparison ---------------
-                xml_s = (xml_soort or '').lower()
-                api_s = (
-                    api_act.soort.value.lower()
-                    if api_act.soort and hasattr(api_act.soort, 'value')
-                    else str(api_act.soort).lower()
-                )
-                if xml_s and api_s:
-                    if xml_s == api_s:
-                        score += SCORE_SOORT_EXACT
-                        reasons.append("Soort exact match")
-                    elif xml_s in api_s:
-                        score += SCORE_SOORT_PARTIAL_XML_IN_API
-                        reasons.append("Soort partial XML in API")
-                    elif api_s in xml_s:
-                        score += SCORE_SOORT_PARTIAL_API_IN_XML
-                        reasons.append("Soort partial API in XML")
-                    else:
-                        # Alias check: if any alias of xml_s appears in api_s
-                        for alias in SOORT_ALIAS.get(xml_s, []):
-                            if alias in api_s:
-                                score += SCORE_SOORT_PARTIAL_XML_IN_API
-                                reasons.append(f"Soort alias match ('{alias}')")
-                                break
-
-                # ------------------------ Onderwerp / titel fuzz ---------
-                api_ond = (api_act.onderwerp or '').lower()
-                # Normalised versions for fuzzy comparison (A)
-                xml_ond = (xml_onderwerp or '').lower()
-                xml_tit = (xml_titel or '').lower()
-
-                norm_api_ond = normalize_topic(api_ond)
-                norm_xml_ond = normalize_topic(xml_ond)
-                norm_xml_tit = normalize_topic(xml_tit)
-
-                if xml_ond and api_ond:
-                    if norm_xml_ond == norm_api_ond:
-                        score += SCORE_ONDERWERP_EXACT
-                        reasons.append("Onderwerp exact")
-                    else:
-                        ratio = fuzz.ratio(norm_xml_ond, norm_api_ond)
-                        if ratio >= FUZZY_SIMILARITY_THRESHOLD_HIGH:
-                            score += SCORE_ONDERWERP_FUZZY_HIGH
-                            reasons.append(f"Onderwerp fuzzy high ({ratio}%)")
-                        elif ratio >= FUZZY_SIMILARITY_THRESHOLD_MEDIUM:
-                            score += SCORE_ONDERWERP_FUZZY_MEDIUM
-                            reasons.append(f"Onderwerp fuzzy medium ({ratio}%)")
-
-                if xml_tit and api_ond:
-                    if norm_xml_tit == norm_api_ond:
-                        score += SCORE_TITEL_EXACT_VS_API_ONDERWERP
-                        reasons.append("Titel exact vs API onderwerp")
-                    else:
-                        ratio = fuzz.ratio(norm_xml_tit, norm_api_ond)
-                        if ratio >= FUZZY_SIMILARITY_THRESHOLD_HIGH:
-                            score += SCORE_TITEL_FUZZY_HIGH_VS_API_ONDERWERP
-                            reasons.append(f"Titel fuzzy high ({ratio}%)")
-                        elif ratio >= FUZZY_SIMILARITY_THRESHOLD_MEDIUM:
-                            score += SCORE_TITEL_FUZZY_MEDIUM_VS_API_ONDERWERP
-                            reasons.append(f"Titel fuzzy medium ({ratio}%)")
+def _parse_vlos(xml_path: str):
+    """Parse a VLOS file with this thread's lxml parser; returns the root element.
+
+    ID collection is off (VLOS uses ``objectid`` attributes, not xml:id) and
+    huge_tree lifts libxml2's limits for long verslagen. Blank text is kept:
+    collapse_text relies on the whitespace between inline elements.
+    """
+    parser = getattr(_thread_local, 'parser', None)
+    if parser is None:
+        parser = _thread_local.parser = ET.XMLParser(huge_tree=True, collect_ids=False)
+    return ET.parse(xml_path, parser).getroot()
+
 
+def iter_activiteiten(xml_path: str):
+    """Stream the top-level <activiteit> elements of a VLOS file.
+
+    Each activiteit is cleared, and dropped from the partially built tree
+    together with the siblings before it, once the consumer moves on – so
+    only one activiteit subtree is held in memory at a time.
+    """
+    for _, xml_act in ET.iterparse(xml_path, events=('end',), tag=VLOS_ACTIVITEIT,
+                                   huge_tree=True, collect_ids=False):
+        parent = xml_act.getparent()
+        if parent is None or parent.tag != VLOS_VERGADERING:
+            continue  # nested activiteit – handled as part of its ancestor
+        yield xml_act
+        xml_act.clear(keep_tail=False)
+        while xml_act.getprevious() is not None:
+            del parent[0]
+
+
+def _process_file(xml_path: str, api: TKApi) -> FileResult:
+    """Match one VLOS XML file against the TK-API; output is buffered in ``lines``."""
+    res = FileResult(xml_path=xml_path)
+    emit = res.lines.append
+
+    emit(REPORT_SEP)
+    emit(f'Processing XML file: {xml_path}')
+
+    # Streamed: the vergadering's own fields precede its activiteiten, so they
+    # are complete once the first activiteit has been parsed
+    acts = iter_activiteiten(xml_path)
+    first_act = next(acts, None)
+    if first_act is not None:
+        vergadering_el = first_act.getparent()
+        acts = itertools.chain([first_act], acts)
+    else:
+        vergadering_el = _parse_vlos(xml_path).find(VLOS_VERGADERING)
+    assert vergadering_el is not None, 'XML lacks <vergadering> element.'
+
+    # Extract basic vergadering info
+    xml_soort = vergadering_el.get('soort', '')
+    xml_titel = vergadering_el.findtext(VLOS_TITEL, default='')
+    xml_nummer = vergadering_el.findtext(VLOS_VERGADERINGNUMMER, default='').strip()
+    xml_date_str = vergadering_el.findtext(VLOS_DATUM, default='')
+    assert xml_date_str, 'XML vergadering missing <datum>'
+
+    target_date = datetime.strptime(xml_date_str.split('T')[0], '%Y-%m-%d')
+    utc_start = target_date - timedelta(hours=LOCAL_TIMEZONE_OFFSET_HOURS)
+    utc_end = target_date + timedelta(days=1) - timedelta(hours=LOCAL_TIMEZONE_OFFSET_HOURS)
+
+    v_filter = Vergadering.create_filter()
+    v_filter.filter_date_range(begin_datetime=utc_start, end_datetime=utc_end)
+    if xml_soort:
+        xml_soort_lower = xml_soort.lower()
+        if xml_soort_lower == 'plenair':
+            v_filter.filter_soort(VergaderingSoort.PLENAIR)
+        elif xml_soort_lower == 'commissie':
+            v_filter.filter_soort(VergaderingSoort.COMMISSIE)
+        else:
+            v_filter.filter_soort(xml_soort)
+    # Plain ASCII digits only (what int() accepted here in practice); drop leading
+    # zeros so the OData literal matches the old int() round-trip
+    if xml_nummer.isascii() and xml_nummer.isdigit():
+        v_filter.add_filter_str(f"VergaderingNummer eq {xml_nummer.lstrip('0') or '0'}")
+
+    vergaderingen = get_vergaderingen_with_verslag(api, v_filter)
+    assert vergaderingen, 'No TKApi Vergadering found for XML file.'
+    canonical_verg = vergaderingen[0]
+    emit(f'Canonical Vergadering chosen: {canonical_verg.id} ({canonical_verg.titel})')
+
+    # Fetch activiteiten in timeframe (reuse earlier logic)
+    act_filter = Activiteit.create_filter()
+    time_buffer = timedelta(minutes=60)  # wider buffer (±1 hour)
+
+    # tkapi re-parses the OData string on every .begin/.einde access, so read
+    # them once and reuse the datetimes below
+    verg_begin = canonical_verg.begin
+    verg_einde = canonical_verg.einde
+
+    # Convert to UTC before sending to TK-API – avoids paging out morning items
+    start_utc = (verg_begin - time_buffer).astimezone(timezone.utc)
+    end_utc = (verg_einde + time_buffer).astimezone(timezone.utc)
+
+    act_filter.filter_date_range(
+        begin_datetime=start_utc,
+        end_datetime=end_utc,
+    )
+    candidate_acts = api.get_items(Activiteit, filter=act_filter, max_items=200)
+
+    # Drop Agendapunt import – we focus on Activiteit matching
+
+    emit(f'Fetched {len(candidate_acts)} candidate API activiteiten')
+
+    # Per-candidate fields that do not depend on the XML activiteit – computed
+    # once per file instead of once per (XML activiteit, candidate) pair
+    api_cache = []
+    for a in candidate_acts:
+        ond_lower = (a.onderwerp or '').lower()
+        api_cache.append({
+            'act': a,
+            'soort_lower': (
+                a.soort.value.lower()
+                if a.soort and hasattr(a.soort, 'value')
+                else str(a.soort).lower()
+            ),
+            'ond_lower': ond_lower,
+            'norm_ond': normalize_topic(ond_lower),
+            'begin_us': epoch_us(get_utc_datetime(a.begin, LOCAL_TIMEZONE_OFFSET_HOURS)),
+            'einde_us': epoch_us(get_utc_datetime(a.einde, LOCAL_TIMEZONE_OFFSET_HOURS)),
+        })
+
+    # The same timeframes as int64 arrays, so each XML activiteit classifies
+    # every candidate with a handful of vectorised comparisons
+    api_time_valid = np.array(
+        [c['begin_us'] is not None and c['einde_us'] is not None for c in api_cache], dtype=bool
+    )
+    api_begin_us = np.array([c['begin_us'] or 0 for c in api_cache], dtype=np.int64)
+    api_einde_us = np.array([c['einde_us'] or 0 for c in api_cache], dtype=np.int64)
+    api_has_ond = np.array([bool(c['ond_lower']) for c in api_cache], dtype=bool)
+    api_norm_onds = [c['norm_ond'] for c in api_cache]
+    # Distinct soorten – soort_match runs once per (XML soort, API soort) pair
+    api_soort_pos = {}
+    api_soort_idx = np.array(
+        [api_soort_pos.setdefault(c['soort_lower'], len(api_soort_pos)) for c in api_cache], dtype=np.int64
+    )
+    api_soorten = list(api_soort_pos)
+    verg_begin_us = epoch_us(get_utc_datetime(verg_begin, LOCAL_TIMEZONE_OFFSET_HOURS))
+    verg_einde_us = epoch_us(get_utc_datetime(verg_einde, LOCAL_TIMEZONE_OFFSET_HOURS))
+
+    # ------------------------------------------------------------------
+    # Match each top-level XML <activiteit> directly to API Activiteit
+    # ------------------------------------------------------------------
+    file_xml_count = 0
+    file_match_count = 0
+
+    # Speakers and zaak references are resolved up front by prefetch_files;
+    # lookups missed there fall back to per-call queries.
+    for xml_act in acts:
+        xml_soort = xml_act.get('soort', '').lower()
+        xml_titel = xml_act.findtext(VLOS_TITEL, default='').lower()
+
+        # Skip procedural activities that don't have meaningful API counterparts
+        if (xml_soort in ['opening', 'sluiting'] or 
+            'opening' in xml_titel or 'sluiting' in xml_titel):
+            emit(f'  ⏭️ Skipping procedural activity: "{xml_soort}" - "{xml_titel}"')
+            continue
+
+        res.total_xml_acts += 1
+        file_xml_count += 1
+        xml_id = xml_act.get('objectid')  # Keep for debugging, but don't use as key
+        xml_soort = xml_act.get('soort')  # Get original soort for processing
+        xml_titel = xml_act.findtext(VLOS_TITEL, default='')  # Get original titel for processing
+        xml_onderwerp = xml_act.findtext(VLOS_ONDERWERP, default='')
+
+        xml_start_us = xml_time_us(
+            xml_act.findtext(VLOS_AANVANGSTIJD, default=None)
+            or xml_act.findtext(VLOS_MARKEERTIJDBEGIN, default=None)
+        )
+        xml_end_us = xml_time_us(
+            xml_act.findtext(VLOS_EINDTIJD, default=None)
+            or xml_act.findtext(VLOS_MARKEERTIJDEIND, default=None)
+        )
+
+        # C) Fallback to canonical vergadering timeframe when XML lacks explicit times
+        if xml_start_us is None:
+            xml_start_us = verg_begin_us
+        if xml_end_us is None:
+            xml_end_us = verg_einde_us
+
+        best_match = None
+        best_score = 0.0
+        runner_up_score = 0.0  # second-highest score (may equal best_score)
+        potential_matches = []  # (score, reasons, api_act) – only collected when VLOS_DEBUG
+
+        xml_ond = (xml_onderwerp or '').lower()
+        xml_tit = (xml_titel or '').lower()
+        norm_xml_ond = normalize_topic(xml_ond)
+        norm_xml_tit = normalize_topic(xml_tit)
+        xml_s = (xml_soort or '').lower()
+        if xml_start_us is not None and xml_end_us is None:
+            xml_end_us = xml_start_us + 60 * 1_000_000  # start + 1 minute
+
+        # Time + soort score for every candidate, then topic scores for the
+        # candidates that can still end up best or runner-up
+        if xml_start_us is None:
+            time_codes = np.zeros(len(api_cache), dtype=np.int64)
+        else:
+            time_codes = time_match_codes(
+                xml_start_us, xml_end_us, api_begin_us, api_einde_us, api_time_valid
+            )
+        soort_scores = np.array([soort_match(xml_s, api_s)[0] for api_s in api_soorten], dtype=np.float64)
+        partial = TIME_MATCH_SCORES[time_codes] + soort_scores[api_soort_idx]
+        survivors, scores, ond_exact, ond_ratios, tit_exact, tit_ratios = score_candidates(
+            partial, api_has_ond, api_norm_onds, xml_ond, xml_tit, norm_xml_ond, norm_xml_tit,
+            prune=not VLOS_DEBUG,  # the debug listing wants every score
+        )
+
+        # Top-2: ties keep the earliest candidate as best; scores start from 0.0
+        if scores.size:
+            top = int(np.argmax(scores))
+            if scores[top] > best_score:
+                best_score = float(scores[top])
+                best_match = api_cache[survivors[top]]['act']
+                if scores.size > 1:
+                    runner_up_score = max(runner_up_score, float(np.partition(scores, -2)[-2]))
+
+        if VLOS_DEBUG:
+            for pos, idx in enumerate(survivors.tolist()):
+                c = api_cache[idx]
+                reasons = []
+                time_score, time_reason = TIME_MATCH_RESULTS[time_codes[idx]]
+                if time_score:
+                    reasons.append(time_reason)
+                soort_reason = soort_match(xml_s, c['soort_lower'])[1]
+                if soort_reason:
+                    reasons.append(soort_reason)
+                if xml_ond and c['ond_lower'] and (ond_exact[pos] or ond_ratios[pos] >= FUZZY_SIMILARITY_THRESHOLD_MEDIUM):
+                    reasons.append(_topic_reason('Onderwerp', 'Onderwerp exact', ond_exact[pos], ond_ratios[pos]))
+                if xml_tit and c['ond_lower'] and (tit_exact[pos] or tit_ratios[pos] >= FUZZY_SIMILARITY_THRESHOLD_MEDIUM):
+                    reasons.append(_topic_reason('Titel', 'Titel exact vs API onderwerp', tit_exact[pos], tit_ratios[pos]))
                 potential_matches.append({
-                    'score': score,
+                    'score': float(scores[pos]),
                     'reasons': reasons,
-                    'api_act': api_act,
+                    'api_act': c['act'],
                 })
 
-                if score > best_score:
-                    best_score = score
-                    best_match = api_act
-
-            # Sort potentials by score desc
-            potential_matches.sort(key=lambda d: d['score'], reverse=True)
-
-            # ------------------------ Reporting ---------------------------
-            print(f'  XML activiteit {xml_id} ("{xml_titel}") best score: {best_score:.2f}')
+        # ------------------------ Reporting ---------------------------
+        emit(f'  XML activiteit {xml_id} ("{xml_titel}") best score: {best_score:.2f}')
 
-            # Detailed listing of all potentials for debugging
-            for pot in potential_matches:
-                act = pot['api_act']
-                api_soort_display = (
-                    act.soort.value if act.soort and hasattr(act.soort, 'value') else str(act.soort)
-                )
-                print(
-                    f"    -> API_ID={act.id}, Score={pot['score']:.2f}, Soort='{api_soort_display}', "
-                    f"Onderwerp='{act.onderwerp}', Reasons={'; '.join(pot['reasons'])}"
-                )
+        # Detailed listing of the top potentials for debugging
+        for pot in heapq.nlargest(VLOS_DEBUG_TOP_N, potential_matches, key=lambda d: d['score']):
+            act = pot['api_act']
+            api_soort_display = (
+                act.soort.value if act.soort and hasattr(act.soort, 'value') else str(act.soort)
+            )
+            emit(
+                f"    -> API_ID={act.id}, Score={pot['score']:.2f}, Soort='{api_soort_display}', "
+                f"Onderwerp='{act.onderwerp}', Reasons={'; '.join(pot['reasons'])}"
+            )
 
-            # Determine acceptance based on threshold or relative lead (D)
-            accept_match = False
-            if best_score >= MIN_MATCH_SCORE_FOR_ACTIVITEIT:
+        # Determine acceptance based on threshold or relative lead (D)
+        accept_match = False
+        if best_score >= MIN_MATCH_SCORE_FOR_ACTIVITEIT:
+            accept_match = True
+        else:
+            if best_score - runner_up_score >= 1.0 and best_score >= 1.0:
                 accept_match = True
-            else:
-                runner_up_score = potential_matches[1]['score'] if len(potential_matches) > 1 else 0.0
-                if best_score - runner_up_score >= 1.0 and best_score >= 1.0:
-                    accept_match = True
-
-            if accept_match and best_match:
-                print(
-                    f'    ✅ BEST MATCH: API activiteit {best_match.id} '
-                    f'(onderwerp="{best_match.onderwerp}")'
-                )
-                total_matched_acts += 1
-                file_match_count += 1
-                
-                # Use API ID as the key for tracking (not VLOS xml_id)
-                api_activity_id = best_match.id
-            else:
-                print('    ❌ No strong match found')
-                unmatched_acts.append({
-                    'file': xml_path,
-                    'xml_id': xml_id,
-                    'titel': xml_titel,
-                    'best_score': best_score,
-                })
-                # Use fallback key for unmatched activities
-                api_activity_id = f"unmatched_{xml_id}"
 
-            # Initialize tracking for this activity using API ID (not VLOS xml_id)
-            activity_speakers[api_activity_id] = []
-            activity_zaken[api_activity_id] = []
+        if accept_match and best_match:
+            emit(
+                f'    ✅ BEST MATCH: API activiteit {best_match.id} '
+                f'(onderwerp="{best_match.onderwerp}")'
+            )
+            res.total_matched_acts += 1
+            file_match_count += 1
 
-            # ------------------------------------------------------------------
-            # SPEAKER PROCESSING – map <spreker> elements to TK-API Personen
-            # ------------------------------------------------------------------
-            selected_act = best_match if accept_match and best_match else None
-            actor_persons = selected_act.actors if selected_act else []
+            # Use API ID as the key for tracking (not VLOS xml_id)
+            api_activity_id = sys.intern(best_match.id)
+        else:
+            emit('    ❌ No strong match found')
+            res.unmatched_acts.append({
+                'file': xml_path,
+                'xml_id': xml_id,
+                'titel': xml_titel,
+                'best_score': best_score,
+            })
+            # Use fallback key for unmatched activities
+            api_activity_id = f"unmatched_{xml_id}"
+
+        # Initialize tracking for this activity using API ID (not VLOS xml_id).
+        # A fresh list on purpose: a later XML activiteit matched to the same API
+        # activiteit replaces the entry, so a defaultdict would change results.
+        act_speakers = res.activity_speakers[api_activity_id] = []
+        act_zaken = res.activity_zaken[api_activity_id] = []
 
-            for frag in xml_act.findall(".//vlos:draadboekfragment", NS):
-                tekst_el = frag.find("vlos:tekst", NS)
-                if tekst_el is None:
-                    continue
-                speech_text = collapse_text(tekst_el)
-                if not speech_text:
-                    continue
+        # ------------------------------------------------------------------
+        # SPEAKER PROCESSING – map <spreker> elements to TK-API Personen
+        # ------------------------------------------------------------------
+        selected_act = best_match if accept_match and best_match else None
+        actor_persons = selected_act.actors if selected_act else []
+        actor_names = None  # lowered actor names, built for the first speaker
+        # Speakers recur across fragments; the actor set is fixed per activiteit
+        speaker_matches: Dict[Tuple[str, str], Optional[Persoon]] = {}
+
+        for frag in xml_act.iter(VLOS_DRAADBOEKFRAGMENT):
+            tekst_el = next(frag.iterchildren(VLOS_TEKST), None)
+            if tekst_el is None:
+                continue
+            speech_text = collapse_text(tekst_el)
+            if not speech_text:
+                continue
 
-                for sprek_el in frag.findall("vlos:sprekers/vlos:spreker", NS):
-                    v_first = sprek_el.findtext("vlos:voornaam", default="", namespaces=NS)
-                    v_last = (
-                        sprek_el.findtext("vlos:verslagnaam", default="", namespaces=NS)
-                        or sprek_el.findtext("vlos:achternaam", default="", namespaces=NS)
-                    )
+            for sprek_el in _XP_SPREKERS(frag):
+                v_first, v_last = speaker_name(sprek_el)
 
-                    total_speakers += 1
+                res.total_speakers += 1
 
+                key = (v_first, v_last)
+                if key in speaker_matches:
+                    matched = speaker_matches[key]
+                else:
                     # 1) Prefer someone already registered as actor in this activiteit
-                    matched = best_persoon_from_actors(v_first, v_last, actor_persons)
+                    if actor_names is None:
+                        actor_names = _actor_candidates(actor_persons)
+                    matched = best_persoon_from_actors(v_first, v_last, actor_names)
 
                     # 2) Fallback to surname search across all TK-API Personen
                     if not matched:
                         matched = find_best_persoon(api, v_first, v_last)
+                    speaker_matches[key] = matched
+
+                if matched:
+                    res.total_matched_speakers += 1
+                    person_name, person_label = _persoon_display(matched)
+                    res.matched_speaker_labels.add(person_label)
+
+                    # Track this speaker in this activity
+                    speaker_info = SpeakerInfo(
+                        persoon=matched,
+                        name=person_name,
+                        speech_text=speech_text[:200],  # Keep some context
+                    )
+                    act_speakers.append(speaker_info)
 
-                    if matched:
-                        total_matched_speakers += 1
-                        person_label = f"{matched.roepnaam or matched.voornaam} {matched.achternaam} (id {matched.id})"
-                        matched_speaker_labels.append(person_label)
-                        
-                        # Track this speaker in this activity
-                        speaker_info = {
-                            'persoon': matched,
-                            'name': f"{matched.roepnaam or matched.voornaam} {matched.achternaam}",
-                            'speech_text': speech_text[:200],  # Keep some context
-                        }
-                        activity_speakers[api_activity_id].append(speaker_info)
-                        
-                        # Update speaker->activity mapping
-                        if matched.id not in speaker_activity_map:
-                            speaker_activity_map[matched.id] = []
-                        speaker_activity_map[matched.id].append({
-                            'activity_id': api_activity_id,  # Use API ID, not VLOS xml_id
-                            'activity_title': xml_titel,
-                            'speech_preview': speech_text[:100]
-                        })
-                    else:
-                        person_label = f"{v_first} {v_last} [NO MATCH]"
-                        unmatched_speaker_labels.append(person_label)
+                    # Update speaker->activity mapping
+                    res.speaker_activity_map[matched.id].append({
+                        'activity_id': api_activity_id,  # Use API ID, not VLOS xml_id
+                        'activity_title': xml_titel,
+                        'speech_preview': speaker_info.speech_text[:100]
+                    })
+                else:
+                    person_label = f"{v_first} {v_last} [NO MATCH]"
+                    res.unmatched_speaker_labels.add(person_label)
 
-                    print(f"        • {person_label} — \"{speech_text[:120]}...\"")
+                if VLOS_VERBOSE:
+                    emit(f"        • {person_label} — \"{speech_text[:120]}...\"")
 
-            # ------------------------------------------------------------------
-            # ZAAK PROCESSING – link XML <zaak> elements to TK-API Zaken + speakers
-            # ------------------------------------------------------------------
+        # ------------------------------------------------------------------
+        # ZAAK PROCESSING – link XML <zaak> elements to TK-API Zaken + speakers
+        # ------------------------------------------------------------------
 
-            for xml_zaak in xml_act.findall(".//vlos:zaak", NS):
-                total_xml_zaken += 1
+        for xml_zaak in xml_act.iter(VLOS_ZAAK):
+            res.total_xml_zaken += 1
+
+            dossiernr = _XP_DOSSIERNUMMER(xml_zaak)
+            stuknr = _XP_STUKNUMMER(xml_zaak)
+            zaak_titel = _XP_TITEL(xml_zaak).strip()
+
+            # Use enhanced matching with fallback logic
+            match_result = find_best_zaak_or_fallback(api, dossiernr, stuknr)
+
+            # Initialize variables for this zaak
+            zaak_obj = None
+            zaak_type = None
+            zaak_label = None
+
+            if match_result['success']:
+                res.total_matched_zaken += 1
+
+                if match_result['match_type'] == 'zaak':
+                    zaak = match_result['zaak']
+                    zaak_label = f"{zaak.soort.value if zaak.soort else ''} {zaak.nummer} (id {zaak.id})"
+                    zaak_obj = zaak
+                    zaak_type = 'zaak'
+                elif match_result['match_type'] == 'dossier_fallback':
+                    dossier = match_result['dossier']
+                    zaak_label = f"Dossier {dossier.nummer}{(' '+dossier.toevoeging) if dossier.toevoeging else ''} (id {dossier.id}){FALLBACK_MARKER}"
+                    zaak_obj = dossier
+                    zaak_type = 'dossier'
+
+                # The same zaak recurs across activiteiten and files; interned, all
+                # its labels (list entries and connections) share one string
+                zaak_label = sys.intern(zaak_label)
+                if zaak_type == 'zaak':
+                    res.direct_zaak_labels[zaak_label] += 1
+                else:
+                    res.fallback_zaak_labels[zaak_label] += 1
+
+                # Track this zaak in this activity
+                zaak_info = ZaakInfo(
+                    object=zaak_obj,
+                    type=zaak_type,
+                    label=zaak_label,
+                    dossiernr=dossiernr,
+                    stuknr=stuknr,
+                    titel=zaak_titel,
+                )
+                act_zaken.append(zaak_info)
 
-                dossiernr = xml_zaak.findtext("vlos:dossiernummer", default="", namespaces=NS).strip()
-                stuknr = xml_zaak.findtext("vlos:stuknummer", default="", namespaces=NS).strip()
-                zaak_titel = xml_zaak.findtext("vlos:titel", default="", namespaces=NS).strip()
+                # Update zaak->activity mapping
+                res.zaak_activity_map[zaak_obj.id].append({
+                    'activity_id': api_activity_id,  # Use API ID, not VLOS xml_id
+                    'activity_title': xml_titel,
+                    'zaak_title': zaak_titel
+                })
 
-                # Use enhanced matching with fallback logic
-                match_result = find_best_zaak_or_fallback(api, dossiernr, stuknr)
-                
-                # Initialize variables for this zaak
-                zaak_obj = None
-                zaak_type = None
-                zaak_label = None
-
-                if match_result['success']:
-                    total_matched_zaken += 1
-                    
-                    if match_result['match_type'] == 'zaak':
-                        zaak = match_result['zaak']
-                        zaak_label = f"{zaak.soort.value if zaak.soort else ''} {zaak.nummer} (id {zaak.id})"
-                        zaak_obj = zaak
-                        zaak_type = 'zaak'
-                    elif match_result['match_type'] == 'dossier_fallback':
-                        dossier = match_result['dossier']
-                        zaak_label = f"Dossier {dossier.nummer}{(' '+dossier.toevoeging) if dossier.toevoeging else ''} (id {dossier.id}) [FALLBACK]"
-                        zaak_obj = dossier
-                        zaak_type = 'dossier'
-                    
-                    matched_zaak_labels.append(zaak_label)
-                    
-                    # Track this zaak in this activity
-                    zaak_info = {
-                        'object': zaak_obj,
-                        'type': zaak_type,
-                        'label': zaak_label,
-                        'dossiernr': dossiernr,
-                        'stuknr': stuknr,
-                        'titel': zaak_titel
-                    }
-                    activity_zaken[api_activity_id].append(zaak_info)
-                    
-                    # Update zaak->activity mapping
-                    if zaak_obj.id not in zaak_activity_map:
-                        zaak_activity_map[zaak_obj.id] = []
-                    zaak_activity_map[zaak_obj.id].append({
-                        'activity_id': api_activity_id,  # Use API ID, not VLOS xml_id
-                        'activity_title': xml_titel,
-                        'zaak_title': zaak_titel
-                    })
-                    
-                    # Create connections between speakers and this zaak within this activity
-                    for speaker_info in activity_speakers[api_activity_id]:
-                        connection = {
-                            'persoon': speaker_info['persoon'],
-                            'persoon_name': speaker_info['name'],
-                            'zaak_object': zaak_obj,
-                            'zaak_type': zaak_type,
-                            'zaak_label': zaak_label,
-                            'activity_id': api_activity_id,  # Use API ID, not VLOS xml_id
-                            'activity_title': xml_titel,
-                            'context': f"Spoke in activity about {zaak_titel or dossiernr}",
-                            'speech_preview': speaker_info['speech_text']
-                        }
-                        speaker_zaak_connections.append(connection)
+                # Create connections between speakers and this zaak within this activity
+                for speaker_info in act_speakers:
+                    connection = SpeakerZaakConnection(
+                        persoon=speaker_info.persoon,
+                        persoon_name=speaker_info.name,
+                        zaak_object=zaak_obj,
+                        zaak_type=zaak_type,
+                        zaak_label=zaak_label,
+                        activity_id=api_activity_id,
+                        activity_title=xml_titel,
+                        context=f"Spoke in activity about {zaak_titel or dossiernr}",
+                        speech_preview=speaker_info.speech_text,
+                    )
+                    res.add_connection(connection)
+            else:
+                zaak_label = f"[NO MATCH] dossier={dossiernr} stuk={stuknr}"
+                res.unmatched_zaak_labels.add(zaak_label)
+
+            if VLOS_VERBOSE:
+                emit(f"        ↳ Zaak: {zaak_titel or dossiernr} → {zaak_label}")
+
+            # Attempt to link speakers inside this zaak element
+            for sprek_el in _XP_SPREKERS(xml_zaak):
+                v_first, v_last = speaker_name(sprek_el)
+
+                persoon = find_best_persoon(api, v_first, v_last)
+                persoon_name, persoon_label = _persoon_display(persoon) if persoon else (None, None)
+                if VLOS_VERBOSE:
+                    person_display = persoon_label or f"{v_first} {v_last} [NO MATCH]"
+                    emit(f"            • Speaker link: {person_display}")
+
+                # Create direct speaker-zaak connection if both matched
+                if persoon and zaak_obj is not None:
+                    connection = SpeakerZaakConnection(
+                        persoon=persoon,
+                        persoon_name=persoon_name,
+                        zaak_object=zaak_obj,
+                        zaak_type=zaak_type,
+                        zaak_label=zaak_label,
+                        activity_id=api_activity_id,
+                        activity_title=xml_titel,
+                        context=f"Directly linked to {zaak_titel or dossiernr}",
+                        speech_preview=f"[Direct zaak speaker link - no speech text]",
+                    )
+                    res.add_connection(connection)
+
+            # ------------------------------------------------------------------
+            # DOSSIER / DOCUMENT PROCESSING – derive from same dossier/stuk pair
+            # ------------------------------------------------------------------
+
+            if dossiernr:
+                res.total_xml_dossiers += 1
+                dossier_obj = find_best_dossier(api, dossiernr)
+                if dossier_obj:
+                    res.total_matched_dossiers += 1
+                    dossier_label = f"{dossier_obj.nummer}{(' '+dossier_obj.toevoeging) if dossier_obj.toevoeging else ''} (id {dossier_obj.id})"
+                    res.matched_dossier_labels.add(dossier_label)
                 else:
-                    zaak_label = f"[NO MATCH] dossier={dossiernr} stuk={stuknr}"
-                    unmatched_zaak_labels.append(zaak_label)
+                    dossier_label = f"[NO MATCH] {dossiernr}"
+                    res.unmatched_dossier_labels.add(dossier_label)
+
+                emit(f"            ↳ Dossier: {dossiernr} → {dossier_label}")
+
+                if stuknr:
+                    res.total_xml_docs += 1
+                    num, toevoeg = _split_dossier_code(dossiernr)
+                    doc_obj = find_best_document(api, num, toevoeg, stuknr)
+                    if doc_obj:
+                        res.total_matched_docs += 1
+                        doc_label = f"Doc {doc_obj.nummer or ''}/{doc_obj.volgnummer} (id {doc_obj.id})"
+                        res.matched_doc_labels.add(doc_label)
+                    else:
+                        doc_label = f"[NO MATCH] stuk={stuknr}"
+                        res.unmatched_doc_labels.add(f"{dossiernr}:{stuknr}")
 
-                print(f"        ↳ Zaak: {zaak_titel or dossiernr} → {zaak_label}")
+                    emit(f"                • Document: {stuknr} → {doc_label}")
 
-                # Attempt to link speakers inside this zaak element
-                for sprek_el in xml_zaak.findall("vlos:sprekers/vlos:spreker", NS):
-                    v_first = sprek_el.findtext("vlos:voornaam", default="", namespaces=NS)
-                    v_last = (
-                        sprek_el.findtext("vlos:verslagnaam", default="", namespaces=NS)
-                        or sprek_el.findtext("vlos:achternaam", default="", namespaces=NS)
-                    )
+        # ------------------------------------------------------------------
+        # VOTING ANALYSIS – detect fractie voting patterns in this activity  
+        # ------------------------------------------------------------------
+        if act_zaken:
+            # Only analyze voting if we have topics for context
+            activity_voting_events = analyze_voting_in_activity(xml_act, act_zaken)
+
+            if activity_voting_events:
+                res.all_voting_events.extend(activity_voting_events)
+                emit(f"        📊 Detected {len(activity_voting_events)} voting events in this activity")
+
+                # Show voting summary for debugging
+                for i, vote_event in enumerate(activity_voting_events[:2], 1):  # Show max 2 examples
+                    voor_count = len(vote_event['vote_breakdown'].get('voor', []))
+                    tegen_count = len(vote_event['vote_breakdown'].get('tegen', []))
+                    total_votes = vote_event['total_votes']
+                    emit(f"            • Vote {i}: {vote_event['titel']} → Voor: {voor_count}, Tegen: {tegen_count}/{total_votes}")
+                    if vote_event['topics_discussed']:
+                        emit(f"              Topics: {', '.join(vote_event['topics_discussed'][:2])}")
 
-                    persoon = find_best_persoon(api, v_first, v_last)
-                    person_display = (
-                        f"{persoon.roepnaam or persoon.voornaam} {persoon.achternaam} (id {persoon.id})"
-                        if persoon
-                        else f"{v_first} {v_last} [NO MATCH]"
-                    )
+        # ------------------------------------------------------------------
+        # INTERRUPTION ANALYSIS – detect speaker interruption patterns in this activity
+        # ------------------------------------------------------------------
+        if act_speakers and act_zaken:
+            # Only analyze interruptions if we have both speakers and topics for context
+            activity_interruptions = detect_interruptions_in_activity(
+                xml_act, act_speakers, act_zaken
+            )
+
+            if activity_interruptions:
+                res.all_interruptions.extend(activity_interruptions)
+                emit(f"        🗣️ Detected {len(activity_interruptions)} interruption events in this activity")
 
-                    print(f"            • Speaker link: {person_display}")
-                    
-                    # Create direct speaker-zaak connection if both matched
-                    if persoon and zaak_obj is not None:
-                        connection = {
-                            'persoon': persoon,
-                            'persoon_name': f"{persoon.roepnaam or persoon.voornaam} {persoon.achternaam}",
-                            'zaak_object': zaak_obj,
-                            'zaak_type': zaak_type,
-                            'zaak_label': zaak_label,
-                            'activity_id': api_activity_id,  # Use API ID, not VLOS xml_id
-                            'activity_title': xml_titel,
-                            'context': f"Directly linked to {zaak_titel or dossiernr}",
-                            'speech_preview': f"[Direct zaak speaker link - no speech text]"
-                        }
-                        speaker_zaak_connections.append(connection)
-
-                # ------------------------------------------------------------------
-                # DOSSIER / DOCUMENT PROCESSING – derive from same dossier/stuk pair
-                # ------------------------------------------------------------------
-
-                if dossiernr:
-                    total_xml_dossiers += 1
-                    dossier_obj = find_best_dossier(api, dossiernr)
-                    if dossier_obj:
-                        total_matched_dossiers += 1
-                        dossier_label = f"{dossier_obj.nummer}{(' '+dossier_obj.toevoeging) if dossier_obj.toevoeging else ''} (id {dossier_obj.id})"
-                        matched_dossier_labels.append(dossier_label)
+                # Show a sample interruption for debugging
+                for i, interruption in enumerate(activity_interruptions[:2], 1):  # Show max 2 examples
+                    if interruption['type'] == 'interruption_with_response':
+                        emit(f"            • Interruption {i}: {interruption['original_speaker'].name} → "
+                              f"{interruption['interrupting_speaker'].name} → "
+                              f"{interruption['responding_speaker'].name} (topics: {', '.join(interruption['topics_discussed'][:2])})")
                     else:
-                        dossier_label = f"[NO MATCH] {dossiernr}"
-                        unmatched_dossier_labels.append(dossier_label)
+                        emit(f"            • Interruption {i}: {interruption['original_speaker'].name} → "
+                              f"{interruption['interrupting_speaker'].name} (topics: {', '.join(interruption['topics_discussed'][:2])})")
 
-                    print(f"            ↳ Dossier: {dossiernr} → {dossier_label}")
+    emit(f'File summary: matched {file_match_count}/{file_xml_count} activiteiten')
+    emit('-' * 80)
 
-                    if stuknr:
-                        total_xml_docs += 1
-                        num, toevoeg = _split_dossier_code(dossiernr)
-                        doc_obj = find_best_document(api, num, toevoeg, stuknr)
-                        if doc_obj:
-                            total_matched_docs += 1
-                            doc_label = f"Doc {doc_obj.nummer or ''}/{doc_obj.volgnummer} (id {doc_obj.id})"
-                            matched_doc_labels.append(doc_label)
-                        else:
-                            doc_label = f"[NO MATCH] stuk={stuknr}"
-                            unmatched_doc_labels.append(f"{dossiernr}:{stuknr}")
+    return res
 
-                        print(f"                • Document: {stuknr} → {doc_label}")
 
-            # ------------------------------------------------------------------
-            # VOTING ANALYSIS – detect fractie voting patterns in this activity  
-            # ------------------------------------------------------------------
-            if activity_zaken[api_activity_id]:
-                # Only analyze voting if we have topics for context
-                activity_voting_events = analyze_voting_in_activity(xml_act, activity_zaken[api_activity_id])
-                
-                if activity_voting_events:
-                    all_voting_events.extend(activity_voting_events)
-                    print(f"        📊 Detected {len(activity_voting_events)} voting events in this activity")
-                    
-                    # Show voting summary for debugging
-                    for i, vote_event in enumerate(activity_voting_events[:2], 1):  # Show max 2 examples
-                        voor_count = len(vote_event['vote_breakdown'].get('voor', []))
-                        tegen_count = len(vote_event['vote_breakdown'].get('tegen', []))
-                        total_votes = vote_event['total_votes']
-                        print(f"            • Vote {i}: {vote_event['titel']} → Voor: {voor_count}, Tegen: {tegen_count}/{total_votes}")
-                        if vote_event['topics_discussed']:
-                            print(f"              Topics: {', '.join(vote_event['topics_discussed'][:2])}")
+# ---------------------------------------------------------------------------
+# Test routine
+# ---------------------------------------------------------------------------
 
-            # ------------------------------------------------------------------
-            # INTERRUPTION ANALYSIS – detect speaker interruption patterns in this activity
-            # ------------------------------------------------------------------
-            if activity_speakers[api_activity_id] and activity_zaken[api_activity_id]:
-                # Only analyze interruptions if we have both speakers and topics for context
-                activity_interruptions = detect_interruptions_in_activity(
-                    xml_act, activity_speakers[api_activity_id], activity_zaken[api_activity_id]
-                )
-                
-                if activity_interruptions:
-                    all_interruptions.extend(activity_interruptions)
-                    print(f"        🗣️ Detected {len(activity_interruptions)} interruption events in this activity")
-                    
-                    # Show a sample interruption for debugging
-                    for i, interruption in enumerate(activity_interruptions[:2], 1):  # Show max 2 examples
-                        if interruption['type'] == 'interruption_with_response':
-                            print(f"            • Interruption {i}: {interruption['original_speaker']['name']} → "
-                                  f"{interruption['interrupting_speaker']['name']} → "
-                                  f"{interruption['responding_speaker']['name']} (topics: {', '.join(interruption['topics_discussed'][:2])})")
-                        else:
-                            print(f"            • Interruption {i}: {interruption['original_speaker']['name']} → "
-                                  f"{interruption['interrupting_speaker']['name']} (topics: {', '.join(interruption['topics_discussed'][:2])})")
-
-        print(f'File summary: matched {file_match_count}/{file_xml_count} activiteiten')
-        print('-' * 80)
+def test_sample_vlos_files_agendapunt_matching():
+    """Iterate over sample_vlos_*.xml files and attempt to find best API Activiteit matches.
+    
+    Enhanced version with Dossier fallback logic for Zaak matching.
+    """
+    xml_files = glob.glob('sample_vlos_*.xml')
+    assert xml_files, 'No sample_vlos_*.xml files found in repository root.'
+
+    api = TKApi(verbose=False)
+    load_persoon_disk_cache()
+    prefetch_files(api, xml_files)
+    totals = FileResult(xml_path='*')
+    with ThreadPoolExecutor(max_workers=MAX_FILE_WORKERS) as ex:
+        # map() yields in submission order, so the report still reads file by file
+        for file_res in ex.map(_process_file, xml_files, itertools.repeat(api)):
+            # One write per file instead of one print() per line
+            if file_res.lines:
+                sys.stdout.write('\n'.join(file_res.lines) + '\n')
+            totals.merge(file_res)
+    save_persoon_disk_cache()
+
+    # Global counters – activiteiten and speakers
+    total_xml_acts = totals.total_xml_acts
+    total_matched_acts = totals.total_matched_acts
+    total_speakers = totals.total_speakers
+    total_matched_speakers = totals.total_matched_speakers
+    total_xml_zaken = totals.total_xml_zaken
+    total_matched_zaken = totals.total_matched_zaken
+    total_xml_dossiers = totals.total_xml_dossiers
+    total_matched_dossiers = totals.total_matched_dossiers
+    total_xml_docs = totals.total_xml_docs
+    total_matched_docs = totals.total_matched_docs
+
+    unmatched_acts = totals.unmatched_acts
+    matched_speaker_labels = totals.matched_speaker_labels
+    unmatched_speaker_labels = totals.unmatched_speaker_labels
+    direct_zaken = totals.direct_zaak_labels
+    fallback_zaken = totals.fallback_zaak_labels
+    unmatched_zaak_labels = totals.unmatched_zaak_labels
+    matched_dossier_labels = totals.matched_dossier_labels
+    unmatched_dossier_labels = totals.unmatched_dossier_labels
+    matched_doc_labels = totals.matched_doc_labels
+    unmatched_doc_labels = totals.unmatched_doc_labels
+
+    speaker_zaak_connections = totals.speaker_zaak_connections
+    all_interruptions = totals.all_interruptions
+    all_voting_events = totals.all_voting_events
+
+    # The report is assembled in memory and written with a single call
+    report: List[str] = []
+    out = report.append
 
     # Overall summary – activiteit matches
     match_pct = (total_matched_acts / total_xml_acts * 100.0) if total_xml_acts else 0.0
-    print(f"\n=== OVERALL MATCH RATE: {total_matched_acts}/{total_xml_acts} "
-          f"({match_pct:.1f}%) ===")
+    out(f"\n=== OVERALL MATCH RATE: {total_matched_acts}/{total_xml_acts} "
+        f"({match_pct:.1f}%) ===")
 
     # Speaker summary
     if total_speakers:
         speaker_pct = total_matched_speakers / total_speakers * 100.0
-        print(f"=== SPEAKER MATCH RATE: {total_matched_speakers}/{total_speakers} ({speaker_pct:.1f}%) ===")
+        out(f"=== SPEAKER MATCH RATE: {total_matched_speakers}/{total_speakers} ({speaker_pct:.1f}%) ===")
     else:
-        print("No speaker fragments processed.")
+        out("No speaker fragments processed.")
 
     # Detailed speaker lists
-    if matched_speaker_labels:
-        print("\n--- MATCHED SPEAKERS ---")
-        for lbl in sorted(set(matched_speaker_labels)):
-            print(f"  • {lbl}")
-    if unmatched_speaker_labels:
-        print("\n--- UNMATCHED SPEAKERS ---")
-        for lbl in sorted(set(unmatched_speaker_labels)):
-            print(f"  • {lbl}")
+    if VLOS_VERBOSE and matched_speaker_labels:
+        out("\n--- MATCHED SPEAKERS ---")
+        for lbl in sorted(matched_speaker_labels):
+            out(f"  • {lbl}")
+    if VLOS_VERBOSE and unmatched_speaker_labels:
+        out("\n--- UNMATCHED SPEAKERS ---")
+        for lbl in sorted(unmatched_speaker_labels):
+            out(f"  • {lbl}")
 
     # Zaak summary (with fallback logic)
     zaak_pct = (total_matched_zaken / total_xml_zaken * 100.0) if total_xml_zaken else 0.0
-    print(f"\n=== ZAAK MATCH RATE (with Dossier fallback): {total_matched_zaken}/{total_xml_zaken} ({zaak_pct:.1f}%) ===")
+    out(f"\n=== ZAAK MATCH RATE (with Dossier fallback): {total_matched_zaken}/{total_xml_zaken} ({zaak_pct:.1f}%) ===")
 
-    if matched_zaak_labels:
-        print("\n--- MATCHED ZAKEN (including Dossier fallbacks) ---")
-        direct_zaken = [lbl for lbl in matched_zaak_labels if '[FALLBACK]' not in lbl]
-        fallback_zaken = [lbl for lbl in matched_zaak_labels if '[FALLBACK]' in lbl]
+    if VLOS_VERBOSE and (direct_zaken or fallback_zaken):
+        out("\n--- MATCHED ZAKEN (including Dossier fallbacks) ---")
         
         if direct_zaken:
-            print(f"  Direct Zaak matches ({len(direct_zaken)}):")
-            for lbl in sorted(set(direct_zaken)):
-                print(f"    • {lbl}")
+            out(f"  Direct Zaak matches ({direct_zaken.total()}):")
+            for lbl in sorted(direct_zaken):
+                out(f"    • {lbl}")
         
         if fallback_zaken:
-            print(f"  Dossier fallback matches ({len(fallback_zaken)}):")
-            for lbl in sorted(set(fallback_zaken)):
-                print(f"    • {lbl}")
+            out(f"  Dossier fallback matches ({fallback_zaken.total()}):")
+            for lbl in sorted(fallback_zaken):
+                out(f"    • {lbl}")
 
-    if unmatched_zaak_labels:
-        print("\n--- UNMATCHED ZAKEN (no Zaak or Dossier found) ---")
-        for lbl in sorted(set(unmatched_zaak_labels)):
-            print(f"  • {lbl}")
+    if VLOS_VERBOSE and unmatched_zaak_labels:
+        out("\n--- UNMATCHED ZAKEN (no Zaak or Dossier found) ---")
+        for lbl in sorted(unmatched_zaak_labels):
+            out(f"  • {lbl}")
 
     # ------------------------------------------------------------
     # Dossier summary
     dossier_pct = (total_matched_dossiers / total_xml_dossiers * 100.0) if total_xml_dossiers else 0.0
-    print(f"\n=== DOSSIER MATCH RATE: {total_matched_dossiers}/{total_xml_dossiers} ({dossier_pct:.1f}%) ===")
+    out(f"\n=== DOSSIER MATCH RATE: {total_matched_dossiers}/{total_xml_dossiers} ({dossier_pct:.1f}%) ===")
 
-    if matched_dossier_labels:
-        print("\n--- MATCHED DOSSIERS ---")
-        for lbl in sorted(set(matched_dossier_labels)):
-            print(f"  • {lbl}")
+    if VLOS_VERBOSE and matched_dossier_labels:
+        out("\n--- MATCHED DOSSIERS ---")
+        for lbl in sorted(matched_dossier_labels):
+            out(f"  • {lbl}")
 
-    if unmatched_dossier_labels:
-        print("\n--- UNMATCHED DOSSIERS ---")
-        for lbl in sorted(set(unmatched_dossier_labels)):
-            print(f"  • {lbl}")
+    if VLOS_VERBOSE and unmatched_dossier_labels:
+        out("\n--- UNMATCHED DOSSIERS ---")
+        for lbl in sorted(unmatched_dossier_labels):
+            out(f"  • {lbl}")
 
     # ------------------------------------------------------------
     # Document summary
     doc_pct = (total_matched_docs / total_xml_docs * 100.0) if total_xml_docs else 0.0
-    print(f"\n=== DOCUMENT MATCH RATE: {total_matched_docs}/{total_xml_docs} ({doc_pct:.1f}%) ===")
+    out(f"\n=== DOCUMENT MATCH RATE: {total_matched_docs}/{total_xml_docs} ({doc_pct:.1f}%) ===")
 
-    if matched_doc_labels:
-        print("\n--- MATCHED DOCUMENTS ---")
-        for lbl in sorted(set(matched_doc_labels)):
-            print(f"  • {lbl}")
+    if VLOS_VERBOSE and matched_doc_labels:
+        out("\n--- MATCHED DOCUMENTS ---")
+        for lbl in sorted(matched_doc_labels):
+            out(f"  • {lbl}")
 
-    if unmatched_doc_labels:
-        print("\n--- UNMATCHED DOCUMENTS ---")
-        for lbl in sorted(set(unmatched_doc_labels)):
-            print(f"  • {lbl}")
+    if VLOS_VERBOSE and unmatched_doc_labels:
+        out("\n--- UNMATCHED DOCUMENTS ---")
+        for lbl in sorted(unmatched_doc_labels):
+            out(f"  • {lbl}")
 
     # ============================================================================
     # NEW: Speaker-Zaak Connection Analysis
     # ============================================================================
     
-    print(f"\n{'='*80}")
-    print(f"🔗 SPEAKER-ZAAK CONNECTION ANALYSIS")
-    print(f"{'='*80}")
+    out(REPORT_SEP)
+    out(f"🔗 SPEAKER-ZAAK CONNECTION ANALYSIS")
+    out(REPORT_BAR)
     
     connection_count = len(speaker_zaak_connections)
-    unique_speakers_with_connections = len(set(conn['persoon'].id for conn in speaker_zaak_connections))
-    unique_zaken_discussed = len(set(conn['zaak_object'].id for conn in speaker_zaak_connections))
+    # The groupings are keyed on persoon / zaak id, so their sizes are the unique counts
+    unique_speakers_with_connections = len(totals.speaker_connections)
+    unique_zaken_discussed = len(totals.zaak_connections)
     
-    print(f"📊 Total speaker-zaak connections: {connection_count}")
-    print(f"👥 Unique speakers with connections: {unique_speakers_with_connections}")
-    print(f"📋 Unique zaken/dossiers discussed: {unique_zaken_discussed}")
+    out(f"📊 Total speaker-zaak connections: {connection_count}")
+    out(f"👥 Unique speakers with connections: {unique_speakers_with_connections}")
+    out(f"📋 Unique zaken/dossiers discussed: {unique_zaken_discussed}")
     
     if speaker_zaak_connections:
-        # Group connections by speaker
-        speaker_connections = {}
-        for conn in speaker_zaak_connections:
-            speaker_id = conn['persoon'].id
-            if speaker_id not in speaker_connections:
-                speaker_connections[speaker_id] = {
-                    'name': conn['persoon_name'],
-                    'connections': []
-                }
-            speaker_connections[speaker_id]['connections'].append(conn)
-        
-        print(f"\n--- TOP SPEAKERS BY LEGISLATIVE ITEMS DISCUSSED ---")
-        speaker_counts = [(sid, len(data['connections']), data['name']) 
-                         for sid, data in speaker_connections.items()]
-        speaker_counts.sort(key=lambda x: x[1], reverse=True)
-        
-        for i, (speaker_id, count, name) in enumerate(speaker_counts[:10], 1):
-            print(f"  {i:2d}. {name}: {count} items")
-        
-        # Group connections by zaak/dossier
-        zaak_connections = {}
-        for conn in speaker_zaak_connections:
-            zaak_id = conn['zaak_object'].id
-            if zaak_id not in zaak_connections:
-                zaak_connections[zaak_id] = {
-                    'label': conn['zaak_label'],
-                    'type': conn['zaak_type'],
-                    'speakers': []
-                }
-            zaak_connections[zaak_id]['speakers'].append(conn)
-        
-        print(f"\n--- TOP LEGISLATIVE ITEMS BY NUMBER OF SPEAKERS ---")
-        zaak_counts = [(zid, len(data['speakers']), data['label']) 
-                      for zid, data in zaak_connections.items()]
-        zaak_counts.sort(key=lambda x: x[1], reverse=True)
-        
-        for i, (zaak_id, count, label) in enumerate(zaak_counts[:10], 1):
-            print(f"  {i:2d}. {label}: {count} speakers")
+        # Connections grouped by speaker (built while collecting)
+        speaker_connections = totals.speaker_connections
+
+        out(f"\n--- TOP SPEAKERS BY LEGISLATIVE ITEMS DISCUSSED ---")
+        # nlargest is stable like sort(), so ties keep first-seen order
+        top_speakers = heapq.nlargest(10, speaker_connections.values(), key=lambda d: len(d['connections']))
+        for i, data in enumerate(top_speakers, 1):
+            out(f"  {i:2d}. {data['name']}: {len(data['connections'])} items")
         
-        # Show some detailed examples
-        print(f"\n--- DETAILED EXAMPLES: WHO SAID WHAT ABOUT WHAT ---")
-        for i, conn in enumerate(speaker_zaak_connections[:5], 1):
-            print(f"\n  Example {i}:")
-            print(f"    👤 Speaker: {conn['persoon_name']}")
-            print(f"    📋 About: {conn['zaak_label']}")
-            print(f"    🎯 Activity: {conn['activity_title']}")
-            print(f"    💬 Speech preview: \"{conn['speech_preview']}...\"")
+        # Connections grouped by zaak/dossier (built while collecting)
+        zaak_connections = totals.zaak_connections
+
+        out(f"\n--- TOP LEGISLATIVE ITEMS BY NUMBER OF SPEAKERS ---")
+        top_zaken = heapq.nlargest(10, zaak_connections.values(), key=lambda d: len(d['speakers']))
+        for i, data in enumerate(top_zaken, 1):
+            out(f"  {i:2d}. {data['label']}: {len(data['speakers'])} speakers")
         
-        if len(speaker_zaak_connections) > 5:
-            print(f"\n    ... and {len(speaker_zaak_connections) - 5} more connections")
+        if VLOS_VERBOSE:
+            # Show some detailed examples
+            out(f"\n--- DETAILED EXAMPLES: WHO SAID WHAT ABOUT WHAT ---")
+            for i, conn in enumerate(speaker_zaak_connections[:5], 1):
+                out(f"\n  Example {i}:")
+                out(f"    👤 Speaker: {conn.persoon_name}")
+                out(f"    📋 About: {conn.zaak_label}")
+                out(f"    🎯 Activity: {conn.activity_title}")
+                out(f"    💬 Speech preview: \"{conn.speech_preview}...\"")
+
+            if len(speaker_zaak_connections) > 5:
+                out(f"\n    ... and {len(speaker_zaak_connections) - 5} more connections")
     
     # ============================================================================
     # NEW: Parliamentary Interruption Analysis - "Who Interrupts Who When Talking About What"
     # ============================================================================
     
-    print(f"\n{'='*80}")
-    print(f"🗣️ PARLIAMENTARY INTERRUPTION ANALYSIS")
-    print(f"{'='*80}")
+    out(REPORT_SEP)
+    out(f"🗣️ PARLIAMENTARY INTERRUPTION ANALYSIS")
+    out(REPORT_BAR)
     
     if all_interruptions:
         interruption_patterns = analyze_interruption_patterns(all_interruptions)
         
-        print(f"📊 Total interruption events detected: {interruption_patterns['total_interruptions']}")
-        print(f"📈 Interruption breakdown:")
+        out(f"📊 Total interruption events detected: {interruption_patterns['total_interruptions']}")
+        out(f"📈 Interruption breakdown:")
         for int_type, count in interruption_patterns['interruption_types'].items():
-            print(f"    • {int_type.replace('_', ' ').title()}: {count}")
+            out(f"    • {int_type.replace('_', ' ').title()}: {count}")
         
         # Top interrupters
         if interruption_patterns['most_frequent_interrupters']:
-            print(f"\n--- TOP INTERRUPTERS (Most Disruptive Speakers) ---")
-            for i, (interrupter, count) in enumerate(list(interruption_patterns['most_frequent_interrupters'].items())[:10], 1):
-                print(f"  {i:2d}. {interrupter}: {count} interruptions")
+            out(f"\n--- TOP INTERRUPTERS (Most Disruptive Speakers) ---")
+            for i, (interrupter, count) in enumerate(itertools.islice(interruption_patterns['most_frequent_interrupters'].items(), 10), 1):
+                out(f"  {i:2d}. {interrupter}: {count} interruptions")
         
         # Most interrupted speakers  
         if interruption_patterns['most_interrupted_speakers']:
-            print(f"\n--- MOST INTERRUPTED SPEAKERS ---")
-            for i, (interrupted, count) in enumerate(list(interruption_patterns['most_interrupted_speakers'].items())[:10], 1):
-                print(f"  {i:2d}. {interrupted}: interrupted {count} times")
+            out(f"\n--- MOST INTERRUPTED SPEAKERS ---")
+            for i, (interrupted, count) in enumerate(itertools.islice(interruption_patterns['most_interrupted_speakers'].items(), 10), 1):
+                out(f"  {i:2d}. {interrupted}: interrupted {count} times")
         
         # Specific interruption pairs (who interrupts whom most)
         if interruption_patterns['interruption_pairs']:
-            print(f"\n--- MOST FREQUENT INTERRUPTION PAIRS ---")
-            for i, (pair, data) in enumerate(list(interruption_patterns['interruption_pairs'].items())[:10], 1):
-                topics_str = ', '.join(list(data['topics'])[:3])
-                if len(data['topics']) > 3:
-                    topics_str += f" (+{len(data['topics'])-3} more)"
-                print(f"  {i:2d}. {pair}: {data['count']} times")
-                print(f"       Topics: {topics_str}")
+            out(f"\n--- MOST FREQUENT INTERRUPTION PAIRS ---")
+            for i, (pair, data) in enumerate(itertools.islice(interruption_patterns['interruption_pairs'].items(), 10), 1):
+                topics = data['topics']
+                topics_str = ', '.join(topics[:3])
+                if len(topics) > 3:
+                    topics_str += f" (+{len(topics) - 3} more)"
+                out(f"  {i:2d}. {pair}: {data['count']} times")
+                out(f"       Topics: {topics_str}")
         
         # Topics that generate most interruptions
         if interruption_patterns['topics_causing_interruptions']:
-            print(f"\n--- TOPICS GENERATING MOST INTERRUPTIONS ---")
-            for i, (topic, data) in enumerate(list(interruption_patterns['topics_causing_interruptions'].items())[:10], 1):
+            out(f"\n--- TOPICS GENERATING MOST INTERRUPTIONS ---")
+            for i, (topic, data) in enumerate(itertools.islice(interruption_patterns['topics_causing_interruptions'].items(), 10), 1):
                 # Clean up topic display
-                topic_display = topic.replace('[FALLBACK]', '').strip()
-                print(f"  {i:2d}. {topic_display}: {data['count']} interruptions")
+                topic_display = topic_label_display(topic)
+                out(f"  {i:2d}. {topic_display}: {data['count']} interruptions")
         
         # Response patterns  
         if interruption_patterns['response_patterns']:
-            print(f"\n--- RESPONSE PATTERNS (Who Responds to Interruptions) ---")
-            for i, (response, data) in enumerate(list(interruption_patterns['response_patterns'].items())[:10], 1):
-                print(f"  {i:2d}. {response}: {data['count']} times")
-        
-        # Detailed examples of interruption dynamics
-        print(f"\n--- DETAILED INTERRUPTION EXAMPLES ---")
-        interesting_interruptions = [
-            interruption for interruption in all_interruptions 
-            if interruption['type'] == 'interruption_with_response' and 
-            interruption['topics_discussed']
-        ][:3]  # Show top 3 most complex examples
+            out(f"\n--- RESPONSE PATTERNS (Who Responds to Interruptions) ---")
+            for i, (response, data) in enumerate(itertools.islice(interruption_patterns['response_patterns'].items(), 10), 1):
+                out(f"  {i:2d}. {response}: {data['count']} times")
         
-        if interesting_interruptions:
-            for i, interruption in enumerate(interesting_interruptions, 1):
-                print(f"\n  Example {i}: Parliamentary Debate Dynamics")
-                print(f"    🎯 Topics being discussed: {', '.join(interruption['topics_discussed'][:2])}")
-                print(f"    🗣️ Original speaker: {interruption['original_speaker']['name']}")
-                print(f"    ⚡ Interrupted by: {interruption['interrupting_speaker']['name']}")
-                print(f"    💬 Interruption length: {interruption['interruption_length']} characters")
-                print(f"    🔄 Response by: {interruption['responding_speaker']['name']}")
-                print(f"    📍 Context: {interruption['context']}")
-        else:
-            # Show simpler interruptions if no complex ones found
-            simple_examples = [i for i in all_interruptions if i['topics_discussed']][:3]
-            for i, interruption in enumerate(simple_examples, 1):
-                print(f"\n  Example {i}: {interruption['type'].replace('_', ' ').title()}")
-                print(f"    🎯 Topics: {', '.join(interruption['topics_discussed'][:2])}")
-                print(f"    🗣️ {interruption['original_speaker']['name']} ⚡ {interruption['interrupting_speaker']['name']}")
-                print(f"    📍 {interruption['context']}")
+        if VLOS_VERBOSE:
+            # Detailed examples of interruption dynamics: the first 3 complex ones,
+            # with the first 3 simpler ones (any with topics) as a stand-in – one scan
+            interesting_interruptions = []
+            simple_examples = []
+            for interruption in all_interruptions:
+                if not interruption['topics_discussed']:
+                    continue
+                if len(simple_examples) < 3:
+                    simple_examples.append(interruption)
+                if interruption['type'] == 'interruption_with_response':
+                    interesting_interruptions.append(interruption)
+                    if len(interesting_interruptions) == 3:
+                        break
+            if interesting_interruptions or simple_examples:
+                out(f"\n--- DETAILED INTERRUPTION EXAMPLES ---")
+
+            if interesting_interruptions:
+                for i, interruption in enumerate(interesting_interruptions, 1):
+                    out(f"\n  Example {i}: Parliamentary Debate Dynamics")
+                    out(f"    🎯 Topics being discussed: {', '.join(interruption['topics_discussed'][:2])}")
+                    out(f"    🗣️ Original speaker: {interruption['original_speaker'].name}")
+                    out(f"    ⚡ Interrupted by: {interruption['interrupting_speaker'].name}")
+                    out(f"    💬 Interruption length: {interruption['interruption_length']} characters")
+                    out(f"    🔄 Response by: {interruption['responding_speaker'].name}")
+                    out(f"    📍 Context: {interruption['context']}")
+            else:
+                for i, interruption in enumerate(simple_examples, 1):
+                    out(f"\n  Example {i}: {interruption['type'].replace('_', ' ').title()}")
+                    out(f"    🎯 Topics: {', '.join(interruption['topics_discussed'][:2])}")
+                    out(f"    🗣️ {interruption['original_speaker'].name} ⚡ {interruption['interrupting_speaker'].name}")
+                    out(f"    📍 {interruption['context']}")
     else:
-        print("📝 No interruption patterns detected in the sample data.")
-        print("💡 This could indicate:")
-        print("    • Very formal debate structure with minimal interruptions")  
-        print("    • Limited speaker interactions in the sample")
-        print("    • Activities with single speakers or clear turn-taking")
+        out("📝 No interruption patterns detected in the sample data.")
+        out("💡 This could indicate:")
+        out("    • Very formal debate structure with minimal interruptions")  
+        out("    • Limited speaker interactions in the sample")
+        out("    • Activities with single speakers or clear turn-taking")
     
     # ============================================================================
     # NEW: Parliamentary Voting Analysis - "Who Voted How On What Topics"
     # ============================================================================
     
-    print(f"\n{'='*80}")
-    print(f"📊 PARLIAMENTARY VOTING ANALYSIS")
-    print(f"{'='*80}")
+    out(REPORT_SEP)
+    out(f"📊 PARLIAMENTARY VOTING ANALYSIS")
+    out(REPORT_BAR)
     
     if all_voting_events:
         voting_patterns = analyze_voting_patterns(all_voting_events)
         
-        print(f"🗳️  Total voting events: {voting_patterns['total_voting_events']}")
-        print(f"📈 Total individual fractie votes: {voting_patterns['total_individual_votes']}")
+        out(f"🗳️  Total voting events: {voting_patterns['total_voting_events']}")
+        out(f"📈 Total individual fractie votes: {voting_patterns['total_individual_votes']}")
         
         # Overall vote distribution
-        print(f"\n--- OVERALL VOTE DISTRIBUTION ---")
         vote_dist = voting_patterns['vote_type_distribution']
         total_votes = sum(vote_dist.values())
         if total_votes > 0:
+            out(f"\n--- OVERALL VOTE DISTRIBUTION ---")
             for vote_type, count in vote_dist.items():
                 percentage = (count / total_votes) * 100
-                print(f"  • {vote_type.title()}: {count} votes ({percentage:.1f}%)")
+                out(f"  • {vote_type.title()}: {count} votes ({percentage:.1f}%)")
         
         # Fractie voting behavior
         if voting_patterns['fractie_vote_counts']:
-            print(f"\n--- FRACTIE VOTING BEHAVIOR ---")
-            for i, (fractie, data) in enumerate(list(voting_patterns['fractie_vote_counts'].items())[:15], 1):
-                voor_pct = (data['voor'] / data['total'] * 100) if data['total'] > 0 else 0
-                tegen_pct = (data['tegen'] / data['total'] * 100) if data['total'] > 0 else 0
-                print(f"  {i:2d}. {fractie}: {data['total']} votes → Voor: {voor_pct:.1f}%, Tegen: {tegen_pct:.1f}%")
+            out(f"\n--- FRACTIE VOTING BEHAVIOR ---")
+            for i, (fractie, data) in enumerate(itertools.islice(voting_patterns['fractie_vote_counts'].items(), 15), 1):
+                total = data['total']
+                if total > 0:
+                    voor_pct = data['voor'] / total * 100
+                    tegen_pct = data['tegen'] / total * 100
+                else:
+                    voor_pct = tegen_pct = 0
+                out(f"  {i:2d}. {fractie}: {total} votes → Voor: {voor_pct:.1f}%, Tegen: {tegen_pct:.1f}%")
         
         # Most supportive fracties (highest "Voor" percentage)
         if voting_patterns['fractie_alignment']:
-            print(f"\n--- MOST SUPPORTIVE FRACTIES (by Voor percentage) ---")
-            for i, (fractie, data) in enumerate(list(voting_patterns['fractie_alignment'].items())[:10], 1):
-                print(f"  {i:2d}. {fractie}: {data['voor_percentage']:.1f}% Voor votes ({data['total_votes']} total)")
+            out(f"\n--- MOST SUPPORTIVE FRACTIES (by Voor percentage) ---")
+            for i, (fractie, data) in enumerate(itertools.islice(voting_patterns['fractie_alignment'].items(), 10), 1):
+                out(f"  {i:2d}. {fractie}: {data['voor_percentage']:.1f}% Voor votes ({data['total_votes']} total)")
         
         # Unanimous topics
         if voting_patterns['unanimous_topics']:
-            print(f"\n--- UNANIMOUS/HIGH CONSENSUS TOPICS ---")
-            for i, (topic, data) in enumerate(list(voting_patterns['unanimous_topics'].items())[:10], 1):
-                topic_display = topic.replace('[FALLBACK]', '').strip()
+            out(f"\n--- UNANIMOUS/HIGH CONSENSUS TOPICS ---")
+            for i, (topic, data) in enumerate(itertools.islice(voting_patterns['unanimous_topics'].items(), 10), 1):
+                topic_display = topic_label_display(topic)
                 consensus = data['consensus_level']
                 votes = data['total_votes']
-                print(f"  {i:2d}. {topic_display}: {consensus:.1f}% consensus ({votes} votes)")
+                out(f"  {i:2d}. {topic_display}: {consensus:.1f}% consensus ({votes} votes)")
         
         # Controversial topics
         if voting_patterns['most_controversial_topics']:
-            print(f"\n--- MOST CONTROVERSIAL TOPICS (Low Consensus) ---")
-            for i, (topic, data) in enumerate(list(voting_patterns['most_controversial_topics'].items())[:10], 1):
-                topic_display = topic.replace('[FALLBACK]', '').strip()
+            out(f"\n--- MOST CONTROVERSIAL TOPICS (Low Consensus) ---")
+            for i, (topic, data) in enumerate(itertools.islice(voting_patterns['most_controversial_topics'].items(), 10), 1):
+                topic_display = topic_label_display(topic)
                 consensus = data['consensus_level']
                 votes = data['total_votes']
-                voor_fracties = ', '.join(data['votes']['voor'][:3])
-                tegen_fracties = ', '.join(data['votes']['tegen'][:3])
-                print(f"  {i:2d}. {topic_display}: {consensus:.1f}% consensus ({votes} votes)")
-                if voor_fracties:
-                    print(f"       Voor: {voor_fracties}{'...' if len(data['votes']['voor']) > 3 else ''}")
-                if tegen_fracties:
-                    print(f"       Tegen: {tegen_fracties}{'...' if len(data['votes']['tegen']) > 3 else ''}")
-        
-        # Detailed voting examples
-        print(f"\n--- DETAILED VOTING EXAMPLES ---")
-        interesting_votes = [
-            event for event in all_voting_events 
-            if event['topics_discussed'] and len(event['vote_breakdown']) > 1
-        ][:3]  # Show top 3 most interesting voting examples
+                voor, tegen = data['votes']['voor'], data['votes']['tegen']
+                out(f"  {i:2d}. {topic_display}: {consensus:.1f}% consensus ({votes} votes)")
+                # Fractie names are never empty, so a non-empty list joins to a non-empty string
+                if voor:
+                    out(f"       Voor: {join_head(voor, 3)}")
+                if tegen:
+                    out(f"       Tegen: {join_head(tegen, 3)}")
         
-        if interesting_votes:
-            for i, vote_event in enumerate(interesting_votes, 1):
-                print(f"\n  Example {i}: {vote_event['titel']}")
-                print(f"    📋 Topics: {', '.join(vote_event['topics_discussed'][:2])}")
-                print(f"    📊 Result: {vote_event['uitslag']}")
-                
-                # Show vote breakdown
-                for vote_type, fracties in vote_event['vote_breakdown'].items():
-                    if fracties:
-                        print(f"    {vote_type.title()}: {', '.join(fracties[:5])}{'...' if len(fracties) > 5 else ''} ({len(fracties)} total)")
-        else:
-            # Show simpler examples if no complex ones found
-            simple_examples = all_voting_events[:3]
-            for i, vote_event in enumerate(simple_examples, 1):
-                print(f"\n  Example {i}: {vote_event['titel']}")
-                if vote_event['topics_discussed']:
-                    print(f"    📋 Topics: {', '.join(vote_event['topics_discussed'][:2])}")
-                print(f"    📊 Result: {vote_event['uitslag']} ({vote_event['total_votes']} votes)")
+        if VLOS_VERBOSE:
+            # Detailed voting examples
+            out(f"\n--- DETAILED VOTING EXAMPLES ---")
+            interesting_votes = list(itertools.islice((
+                event for event in all_voting_events
+                if event['topics_discussed'] and len(event['vote_breakdown']) > 1
+            ), 3))  # Show top 3 most interesting voting examples
+
+            if interesting_votes:
+                for i, vote_event in enumerate(interesting_votes, 1):
+                    out(f"\n  Example {i}: {vote_event['titel']}")
+                    out(f"    📋 Topics: {', '.join(vote_event['topics_discussed'][:2])}")
+                    out(f"    📊 Result: {vote_event['uitslag']}")
+
+                    # Show vote breakdown
+                    for vote_type, fracties in vote_event['vote_breakdown'].items():
+                        if fracties:
+                            out(f"    {vote_type.title()}: {join_head(fracties, 5)} ({len(fracties)} total)")
+            else:
+                # Show simpler examples if no complex ones found
+                simple_examples = all_voting_events[:3]
+                for i, vote_event in enumerate(simple_examples, 1):
+                    out(f"\n  Example {i}: {vote_event['titel']}")
+                    if vote_event['topics_discussed']:
+                        out(f"    📋 Topics: {', '.join(vote_event['topics_discussed'][:2])}")
+                    out(f"    📊 Result: {vote_event['uitslag']} ({vote_event['total_votes']} votes)")
     else:
-        print("📝 No voting events detected in the sample data.")
-        print("💡 This could indicate:")
-        print("    • Sample contains debate/discussion activities without formal votes")
-        print("    • Voting activities might use different XML structures")
-        print("    • Limited voting activities in the time period sampled")
+        out("📝 No voting events detected in the sample data.")
+        out("💡 This could indicate:")
+        out("    • Sample contains debate/discussion activities without formal votes")
+        out("    • Voting activities might use different XML structures")
+        out("    • Limited voting activities in the time period sampled")
     
     # List any unmatched activiteiten
     if unmatched_acts:
-        print(f"\n{'='*80}")
-        print("--- UNMATCHED XML ACTIVITEITEN ---")
+        out(REPORT_SEP)
+        out("--- UNMATCHED XML ACTIVITEITEN ---")
         for item in unmatched_acts:
-            print(f"{item['file']} :: {item['xml_id']} — \"{item['titel']}\" (best score {item['best_score']:.2f})")
+            out(f"{item['file']} :: {item['xml_id']} — \"{item['titel']}\" (best score {item['best_score']:.2f})")
     else:
-        print(f"\n{'='*80}")
-        print("✅ All activiteiten matched successfully!")
+        out(REPORT_SEP)
+        out("✅ All activiteiten matched successfully!")
+
+    sys.stdout.write('\n'.join(report) + '\n')
 
 
 if __name__ == "__main__":
     print("🏛️ Starting Enhanced VLOS Analysis with Interruption & Voting Detection")
-    print("=" * 80)
+    print(REPORT_BAR)
     test_sample_vlos_files_agendapunt_matching()
     print("\n🎯 Analysis complete! This test demonstrates:")
     print("   • Activity matching with fallback logic")
@@ -1,10 +1,18 @@
 import glob
+import itertools
+import sys
 import xml.etree.ElementTree as ET
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
 # Reuse identical matching logic from the activity-matching test
-from thefuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
+from rapidfuzz.distance import Indel
 try:
     from test_vlos_activity_matching import (
         SCORE_TIME_START_PROXIMITY,
@@ -25,7 +33,11 @@ try:
         FUZZY_SIMILARITY_THRESHOLD_MEDIUM,
         SOORT_ALIAS,
         normalize_topic,
-        evaluate_time_match as original_evaluate_time_match,
+        get_utc_datetime,
+        epoch_us,
+        time_match_codes,
+        get_vergaderingen_with_verslag,
+        TIME_MATCH_SCORES,
         parse_xml_datetime as ref_parse_xml_datetime,
     )
 except ModuleNotFoundError:
@@ -48,12 +60,18 @@ except ModuleNotFoundError:
         FUZZY_SIMILARITY_THRESHOLD_MEDIUM,
         SOORT_ALIAS,
         normalize_topic,
-        evaluate_time_match as original_evaluate_time_match,
+        get_utc_datetime,
+        epoch_us,
+        time_match_codes,
+        get_vergaderingen_with_verslag,
+        TIME_MATCH_SCORES,
         parse_xml_datetime as ref_parse_xml_datetime,
     )
 
 # Make sure alias exists regardless of which import branch triggered
 parse_xml_datetime = ref_parse_xml_datetime  # type: ignore
+# Onderwerp/titel strings recur across activiteiten and files
+normalize_topic = lru_cache(maxsize=4096)(normalize_topic)
 
 from tkapi import TKApi
 from tkapi.activiteit import Activiteit
@@ -64,27 +82,118 @@ from tkapi.vergadering import Vergadering, VergaderingSoort
 # Namespace & basic constants (shared with tests/test_vlos_activity_matching)
 # ---------------------------------------------------------------------------
 NS = {"vlos": "http://www.tweedekamer.nl/ggm/vergaderverslag/v1.0"}
+# Clark-notation tags: plain tag lookups skip the prefix/namespace handling of "vlos:..." paths
+VLOS = f"{{{NS['vlos']}}}"
+VERGADERING_TAG = f"{VLOS}vergadering"
+DATUM_TAG = f"{VLOS}datum"
+ACTIVITEIT_TAG = f"{VLOS}activiteit"
+DRAADBOEKFRAGMENT_TAG = f"{VLOS}draadboekfragment"
+TEKST_TAG = f"{VLOS}tekst"
+SPREKER_TAG = f"{VLOS}spreker"
+SPREKERS_SPREKER_PATH = f"{VLOS}sprekers/{SPREKER_TAG}"
 LOCAL_TIMEZONE_OFFSET_HOURS = 2  # CEST for summer samples
+SPEECH_PREVIEW_CHARS = 200
 
 FUZZY_FIRSTNAME_THRESHOLD = 80  # percentage
 FUZZY_SURNAME_THRESHOLD = 85
+# Most a candidate can still gain from the onderwerp and titel comparisons
+# once time/soort are scored
+MAX_ONDERWERP_SCORE = max(SCORE_ONDERWERP_EXACT, SCORE_ONDERWERP_FUZZY_HIGH, SCORE_ONDERWERP_FUZZY_MEDIUM)
+MAX_TITEL_SCORE = max(
+    SCORE_TITEL_EXACT_VS_API_ONDERWERP,
+    SCORE_TITEL_FUZZY_HIGH_VS_API_ONDERWERP,
+    SCORE_TITEL_FUZZY_MEDIUM_VS_API_ONDERWERP,
+)
 
 # Activity-matching helpers now come straight from the original test to avoid divergence
 # ---------------------------------------------------------------------------
 
-# We alias the imported evaluate_time_match so we can keep the name unchanged below.
-def evaluate_time_match(xml_start, xml_end, api_start, api_end):
-    return original_evaluate_time_match(xml_start, xml_end, api_start, api_end)
+@lru_cache(maxsize=4096)
+def soort_score(xml_soort: str, api_soort: str) -> float:
+    """Soort points for a lower-cased XML/API soort pair: exact, partial either way, then alias."""
+    if not (xml_soort and api_soort):
+        return 0.0
+    if xml_soort == api_soort:
+        return SCORE_SOORT_EXACT
+    if xml_soort in api_soort:
+        return SCORE_SOORT_PARTIAL_XML_IN_API
+    if api_soort in xml_soort:
+        return SCORE_SOORT_PARTIAL_API_IN_XML
+    if any(alias in api_soort for alias in SOORT_ALIAS.get(xml_soort, ())):
+        return SCORE_SOORT_PARTIAL_XML_IN_API
+    return 0.0
+
+
+def ensure_aware(dt: Optional[datetime]) -> Optional[datetime]:
+    """Return tz-aware datetime (UTC) even when source is naive."""
+    if dt is None:
+        return None
+    if dt.tzinfo is None or dt.tzinfo.utcoffset(dt) is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
 
 
 def collapse_text(elem: ET.Element) -> str:
     """Return all inner text of an XML element, collapsed to single-spaced string."""
-    texts: List[str] = []
+    return " ".join([t for t in map(str.strip, elem.itertext()) if t])
+
+
+def collapse_text_head(elem: ET.Element, limit: int) -> str:
+    """``collapse_text(elem)[:limit]``, without walking and joining the rest of the text."""
+    parts: List[str] = []
+    size = -1  # length of " ".join(parts)
     for t in elem.itertext():
         t = t.strip()
         if t:
-            texts.append(t)
-    return " ".join(texts)
+            parts.append(t)
+            size += len(t) + 1
+            if size >= limit:
+                break
+    return " ".join(parts)[:limit]
+
+
+def children_text(elem: ET.Element, tags: Dict[str, str]) -> Dict[str, str]:
+    """Text of the first direct child per Clark tag in *tags*, keyed by local name (like ``findtext``)."""
+    found: Dict[str, str] = {}
+    for child in elem:
+        tag = tags.get(child.tag)
+        if tag and tag not in found:
+            found[tag] = child.text or ""
+    return found
+
+
+def _vlos_tags(*names: str) -> Dict[str, str]:
+    return {f"{VLOS}{name}": name for name in names}
+
+
+ACTIVITEIT_TEXT_TAGS = _vlos_tags("titel", "onderwerp", "aanvangstijd", "markeertijdbegin", "eindtijd", "markeertijdeind")
+SPREKER_TEXT_TAGS = _vlos_tags("voornaam", "achternaam", "fractie")
+
+
+def _ratio(s1: str, s2: str, score_cutoff: float = 0) -> int:
+    """``fuzz.ratio`` rounded to an int like thefuzz did.
+
+    Calls the Indel kernel behind ``fuzz.ratio`` directly to skip the wrapper
+    on these short name strings. Scores that cannot round up to *score_cutoff*
+    come back as 0, which lets rapidfuzz stop early; comparisons against the
+    cutoff are unaffected.
+    """
+    cutoff = max(score_cutoff - 1, 0) / 100
+    return round(Indel.normalized_similarity(s1, s2, score_cutoff=cutoff) * 100)
+
+
+def _cdist_ratios(queries: List[str], choices: List[str], score_cutoff: float = 0) -> List[List[int]]:
+    """Batched :func:`_ratio` – one row of rounded scores per query, in one native call."""
+    if not choices:
+        return [[] for _ in queries]
+    matrix = process.cdist(
+        queries,
+        choices,
+        scorer=fuzz.ratio,
+        score_cutoff=max(score_cutoff - 1, 0),
+        dtype=np.float64,
+    )
+    return [[round(v) for v in row] for row in matrix.tolist()]
 
 
 # ---------------------------------------------------------------------------
@@ -99,16 +208,18 @@ def calc_name_similarity(v_first: str, v_last: str, p: Persoon) -> int:
         return score
 
     # Surname exact / fuzzy
-    if v_last.lower() == p_achternaam.lower():
+    v_last_lower = v_last.lower()
+    p_achternaam_lower = p_achternaam.lower()
+    if v_last_lower == p_achternaam_lower:
         score += 60
     else:
-        score += max(fuzz.ratio(v_last.lower(), p_achternaam.lower()) - 20, 0)  # dampen partials
+        score += max(_ratio(v_last_lower, p_achternaam_lower, 20) - 20, 0)  # dampen partials
 
     # Firstname / roepnaam boost
     v_first_lower = (v_first or "").lower()
     if v_first_lower:
         first_candidates = [c for c in [getattr(p, 'roepnaam', None), getattr(p, 'voornaam', None)] if c]
-        best = max((fuzz.ratio(v_first_lower, fc.lower()) for fc in first_candidates), default=0)
+        best = max((_ratio(v_first_lower, fc.lower(), 60) for fc in first_candidates), default=0)
         if best >= FUZZY_FIRSTNAME_THRESHOLD:
             score += 40
         elif best >= 60:
@@ -116,8 +227,20 @@ def calc_name_similarity(v_first: str, v_last: str, p: Persoon) -> int:
     return score
 
 
+# (voornaam, achternaam) -> best Persoon or None; the same speakers recur in
+# many fragments and files, so each distinct name is queried once per run
+_PERSOON_CACHE: Dict[Tuple[str, str], Optional[Persoon]] = {}
+
+
 def find_best_persoon(api: TKApi, v_first: str, v_last: str) -> Optional[Persoon]:
     """Query TK-API for Personen whose surname matches (exact) and pick best fuzzy-scored candidate."""
+    key = (v_first, v_last)
+    if key not in _PERSOON_CACHE:
+        _PERSOON_CACHE[key] = _query_best_persoon(api, v_first, v_last)
+    return _PERSOON_CACHE[key]
+
+
+def _query_best_persoon(api: TKApi, v_first: str, v_last: str) -> Optional[Persoon]:
     if not v_last:
         return None
 
@@ -128,9 +251,10 @@ def find_best_persoon(api: TKApi, v_first: str, v_last: str) -> Optional[Persoon
     pf.add_filter_str(f"Achternaam eq '{safe_last}'")
 
     candidates = api.get_items(Persoon, filter=pf, max_items=100)
-    if not candidates:
-        return None
+    return _pick_best_persoon(v_first, v_last, candidates)
 
+
+def _pick_best_persoon(v_first: str, v_last: str, candidates: List[Persoon]) -> Optional[Persoon]:
     best_p = None
     best_score = 0
     for p in candidates:
@@ -142,10 +266,287 @@ def find_best_persoon(api: TKApi, v_first: str, v_last: str) -> Optional[Persoon
     return best_p if best_score >= 60 else None
 
 
+# Surnames per OR'd Persoon query; keeps the URL well below server limits
+PERSOON_PREFETCH_CHUNK_SIZE = 20
+
+
+def prefetch_personen(api: TKApi, names: List[Tuple[str, str]]) -> None:
+    """Resolve all (voornaam, achternaam) pairs not yet cached with one OR'd surname query per chunk."""
+    pending = [key for key in dict.fromkeys(names) if key not in _PERSOON_CACHE]
+    surnames = sorted({last for _, last in pending if last})
+    if not surnames:
+        return
+
+    by_surname: Dict[str, List[Persoon]] = defaultdict(list)
+    for i in range(0, len(surnames), PERSOON_PREFETCH_CHUNK_SIZE):
+        chunk = surnames[i:i + PERSOON_PREFETCH_CHUNK_SIZE]
+        pf = Persoon.create_filter()
+        safe_lasts = [s.replace("'", "''") for s in chunk]
+        pf.add_filter_str("(" + " or ".join(f"Achternaam eq '{s}'" for s in safe_lasts) + ")")
+        for p in api.get_items(Persoon, filter=pf, max_items=100 * len(chunk)):
+            by_surname[(p.achternaam or "").lower()].append(p)
+
+    for v_first, v_last in pending:
+        _PERSOON_CACHE[(v_first, v_last)] = (
+            _pick_best_persoon(v_first, v_last, by_surname.get(v_last.lower(), [])) if v_last else None
+        )
+
+
 # ---------------------------------------------------------------------------
 # Main routine: iterate sample_vlos_*.xml and print quotes mapped to Persoon & Activiteit
 # ---------------------------------------------------------------------------
 
+# Each file costs a Vergadering, an Activiteit and a few Persoon round trips,
+# so files are matched in parallel. Workers only share _PERSOON_CACHE, whose
+# entries are plain assignments: a race at worst repeats one Persoon query.
+MAX_FILE_WORKERS = 8
+
+
+@dataclass
+class FileResult:
+    """Counters and buffered report output for one VLOS XML file."""
+    lines: List[str] = field(default_factory=list)
+    total_xml_acts: int = 0
+    total_linked_acts: int = 0
+    total_speakers: int = 0
+    total_matched_speakers: int = 0
+
+
+def _process_file(xml_path: str, api: TKApi) -> FileResult:
+    """Match one VLOS XML file against the TK-API; output is buffered in ``lines``."""
+    res = FileResult()
+    emit = res.lines.append
+
+    emit("\n" + "=" * 100)
+    emit(f"Processing XML file: {xml_path}")
+
+    # Parse XML straight from the file; the parser reads it in chunks
+    # instead of holding the decoded text alongside the tree
+    root = ET.parse(xml_path).getroot()
+
+    vergadering_el = root.find(VERGADERING_TAG)
+    assert vergadering_el is not None, "XML lacks <vergadering> element."
+
+    # Resolve every speaker of this file up front in a few bulk queries
+    prefetch_personen(api, [
+        (kids.get("voornaam", ""), kids.get("achternaam", ""))
+        for kids in (
+            children_text(sprek_el, SPREKER_TEXT_TAGS)
+            for sprek_el in vergadering_el.iter(SPREKER_TAG)
+        )
+    ])
+
+    xml_date_str = vergadering_el.findtext(DATUM_TAG, default="")
+    target_date = datetime.strptime(xml_date_str.split("T")[0], "%Y-%m-%d")
+    utc_start = target_date - timedelta(hours=LOCAL_TIMEZONE_OFFSET_HOURS)
+    utc_end = target_date + timedelta(days=1) - timedelta(hours=LOCAL_TIMEZONE_OFFSET_HOURS)
+
+    # Select canonical Vergadering via TK-API (reuse logic from activity matching)
+    v_filter = Vergadering.create_filter()
+    v_filter.filter_date_range(begin_datetime=utc_start, end_datetime=utc_end)
+    vergaderingen = get_vergaderingen_with_verslag(api, v_filter)
+    assert vergaderingen, "No TKApi Vergadering found for XML file."
+    canonical_verg = vergaderingen[0]
+    emit(f"  Canonical Vergadering: {canonical_verg.id} — {canonical_verg.titel}")
+    # .begin/.einde re-parse the OData timestamp on every access
+    verg_begin = canonical_verg.begin
+    verg_einde = canonical_verg.einde
+
+    # Pre-fetch Kandidaten activiteiten in (begin-1h, einde+1h) timeframe
+    act_filter = Activiteit.create_filter()
+    buffer = timedelta(minutes=60)
+    act_filter.filter_date_range(
+        begin_datetime=(verg_begin - buffer).astimezone(timezone.utc),
+        end_datetime=(verg_einde + buffer).astimezone(timezone.utc),
+    )
+    candidate_acts = api.get_items(Activiteit, filter=act_filter, max_items=200)
+    emit(f"  Retrieved {len(candidate_acts)} candidate activiteiten from TK-API")
+
+    # Per-candidate fields do not depend on the XML activiteit: extract them
+    # once per file into parallel lists, so the scoring loop does no attribute
+    # or datetime parsing work. The normalised onderwerpen let each XML
+    # activiteit score all candidates against its onderwerp and titel in one
+    # batched call.
+    cand_begins = [epoch_us(get_utc_datetime(c.begin, LOCAL_TIMEZONE_OFFSET_HOURS)) for c in candidate_acts]
+    cand_eindes = [epoch_us(get_utc_datetime(c.einde, LOCAL_TIMEZONE_OFFSET_HOURS)) for c in candidate_acts]
+    cand_time_valid = np.array([b is not None and e is not None for b, e in zip(cand_begins, cand_eindes)], dtype=bool)
+    cand_begin_us = np.array([b or 0 for b in cand_begins], dtype=np.int64)
+    cand_einde_us = np.array([e or 0 for e in cand_eindes], dtype=np.int64)
+    cand_onds = [(c.onderwerp or "").lower() for c in candidate_acts]
+    cand_soorten = [
+        c.soort.value.lower() if c.soort and hasattr(c.soort, "value") else str(c.soort).lower()
+        for c in candidate_acts
+    ]
+    cand_has_ond = np.array([bool(ond) for ond in cand_onds], dtype=bool)
+    norm_api_onds = [normalize_topic(ond) for ond in cand_onds]
+    soort_pos: Dict[str, int] = {}
+    cand_soort_idx = np.array(
+        [soort_pos.setdefault(soort, len(soort_pos)) for soort in cand_soorten], dtype=np.intp
+    )
+    distinct_soorten = list(soort_pos)
+    verg_begin_aware = ensure_aware(verg_begin)
+    verg_einde_aware = ensure_aware(verg_einde)
+
+    # Iterate XML activiteiten and map to API using simple key (time+soort) first; fallback by fuzzy titel
+    for xml_act in vergadering_el.findall(ACTIVITEIT_TAG):
+        xml_soort = (xml_act.get("soort") or "").lower()
+        act_kids = children_text(xml_act, ACTIVITEIT_TEXT_TAGS)
+        xml_title = act_kids.get("titel", "")
+        xml_onderwerp = act_kids.get("onderwerp", "")
+
+        xml_start_raw = parse_xml_datetime(
+            act_kids.get("aanvangstijd") or act_kids.get("markeertijdbegin")
+        )
+        xml_start = ensure_aware(xml_start_raw) or verg_begin_aware
+
+        # --------------------------------------------------
+        # Improved matching: score all candidate_acts and pick best
+        # --------------------------------------------------
+
+        xml_end_raw = parse_xml_datetime(
+            act_kids.get("eindtijd") or act_kids.get("markeertijdeind")
+        )
+        xml_end = ensure_aware(xml_end_raw) or verg_einde_aware
+
+        # Only the best candidate and the runner-up score decide acceptance,
+        # so track those two instead of collecting and sorting every score
+        best_match = None
+        best_score = 0.0
+        runner_up_score = 0.0
+
+        norm_xml_ond = normalize_topic(xml_onderwerp.lower())
+        norm_xml_tit = normalize_topic(xml_title.lower())
+
+        # Soort points depend only on the soort pair: score each distinct
+        # candidate soort once per XML activiteit
+        soort_scores = np.array(
+            [soort_score(xml_soort, api_soort) for api_soort in distinct_soorten], dtype=np.float64
+        )
+        if xml_start is not None:
+            xml_end_eff = xml_end or (xml_start + timedelta(minutes=1))
+            time_codes = time_match_codes(
+                epoch_us(get_utc_datetime(xml_start, LOCAL_TIMEZONE_OFFSET_HOURS)),
+                epoch_us(get_utc_datetime(xml_end_eff, LOCAL_TIMEZONE_OFFSET_HOURS)),
+                cand_begin_us, cand_einde_us, cand_time_valid,
+            )
+            time_scores = TIME_MATCH_SCORES[time_codes]
+        else:
+            time_scores = np.zeros(len(candidate_acts), dtype=np.float64)
+        # ------------------------ Time proximity + soort ---------
+        partial = time_scores + soort_scores[cand_soort_idx]
+
+        # The runner-up ends on at least the second-highest partial score, so
+        # a candidate that cannot reach it even with perfect onderwerp/titel
+        # scores changes neither top-2 score: drop it before the fuzzing.
+        # Topic points only apply to candidates with an onderwerp.
+        if partial.size > 1:
+            topic_max = (MAX_ONDERWERP_SCORE if xml_onderwerp else 0.0) + (MAX_TITEL_SCORE if xml_title else 0.0)
+            prune_below = np.partition(partial, -2)[-2]
+            survivors = np.flatnonzero(
+                partial + np.where(cand_has_ond, topic_max, 0.0) >= prune_below
+            ).tolist()
+        else:
+            survivors = list(range(partial.size))
+        ond_ratios, tit_ratios = _cdist_ratios(
+            [norm_xml_ond, norm_xml_tit],
+            [norm_api_onds[i] for i in survivors],
+            FUZZY_SIMILARITY_THRESHOLD_MEDIUM,
+        )
+
+        for pos, (i, score) in enumerate(zip(survivors, partial[survivors].tolist())):
+            # ------------------------ Onderwerp / titel fuzz ---------
+            cand_ond = cand_onds[i]
+            norm_api_ond = norm_api_onds[i]
+
+            if xml_onderwerp and cand_ond:
+                if norm_xml_ond == norm_api_ond:
+                    score += SCORE_ONDERWERP_EXACT
+                else:
+                    ratio = ond_ratios[pos]
+                    if ratio >= FUZZY_SIMILARITY_THRESHOLD_HIGH:
+                        score += SCORE_ONDERWERP_FUZZY_HIGH
+                    elif ratio >= FUZZY_SIMILARITY_THRESHOLD_MEDIUM:
+                        score += SCORE_ONDERWERP_FUZZY_MEDIUM
+
+            if xml_title and cand_ond:
+                if norm_xml_tit == norm_api_ond:
+                    score += SCORE_TITEL_EXACT_VS_API_ONDERWERP
+                else:
+                    ratio = tit_ratios[pos]
+                    if ratio >= FUZZY_SIMILARITY_THRESHOLD_HIGH:
+                        score += SCORE_TITEL_FUZZY_HIGH_VS_API_ONDERWERP
+                    elif ratio >= FUZZY_SIMILARITY_THRESHOLD_MEDIUM:
+                        score += SCORE_TITEL_FUZZY_MEDIUM_VS_API_ONDERWERP
+
+            if score > best_score:
+                runner_up_score = best_score
+                best_score = score
+                best_match = candidate_acts[i]
+            elif score > runner_up_score:
+                runner_up_score = score
+
+        # Determine acceptance based on threshold or relative lead (same as activity match)
+        api_act = None
+        if best_match:
+            if best_score >= MIN_MATCH_SCORE_FOR_ACTIVITEIT:
+                api_act = best_match
+            elif best_score - runner_up_score >= 1.0 and best_score >= 1.0:
+                api_act = best_match
+
+        # Optionally print reasons for best match (debugging)
+        if api_act:
+            emit(f"    ✅ BEST MATCH: API activiteit {api_act.id} (onderwerp='{api_act.onderwerp}') – score {best_score:.2f}")
+        else:
+            emit(f"    ❌ No strong match found (best score {best_score:.2f})")
+
+        # --------------------------------------------------
+        # Track activiteit linkage success
+        # --------------------------------------------------
+        res.total_xml_acts += 1
+        if api_act:
+            res.total_linked_acts += 1
+
+        api_act_id = api_act.id if api_act else "UNKNOWN"
+        emit("\n" + "-" * 80)
+        emit(f"XML activiteit '{xml_title}' (soort={xml_soort}) mapped to API {api_act_id}")
+
+        # ------------------------------------------------------------------
+        # Extract all draadboekfragmenten (these carry speeches)
+        # ------------------------------------------------------------------
+        for frag in xml_act.iter(DRAADBOEKFRAGMENT_TAG):
+            # Compile one clean text string
+            tekst_el = frag.find(TEKST_TAG)
+            if tekst_el is None:
+                continue
+            # Only a preview of each speech is printed
+            speech_text = collapse_text_head(tekst_el, SPEECH_PREVIEW_CHARS)
+            if not speech_text:
+                continue
+
+            # Gather speakers listed for this fragment
+            for sprek_el in frag.findall(SPREKERS_SPREKER_PATH):
+                sprek_kids = children_text(sprek_el, SPREKER_TEXT_TAGS)
+                v_first = sprek_kids.get("voornaam", "")
+                v_last = sprek_kids.get("achternaam", "")
+                fractie = sprek_kids.get("fractie", "")
+
+                matched_persoon = find_best_persoon(api, v_first, v_last)
+                # --------------------------------------------------
+                # Track speaker resolution success
+                # --------------------------------------------------
+                res.total_speakers += 1
+                if matched_persoon:
+                    res.total_matched_speakers += 1
+                if matched_persoon:
+                    person_label = f"{matched_persoon.roepnaam or matched_persoon.voornaam} {matched_persoon.achternaam} (TK-API id {matched_persoon.id})"
+                else:
+                    person_label = f"{v_first} {v_last} [NO MATCH]"
+
+                emit(f"  • {person_label} [{fractie}] —\n    \"{speech_text}...\"") 
+
+    return res
+
+
 def test_vlos_speaker_quote_matching():
     """End-to-end smoke test: print which Persoon (TK-API) spoke during which Activity."""
     api = TKApi(verbose=False)
@@ -161,224 +562,14 @@ def test_vlos_speaker_quote_matching():
     total_speakers = 0
     total_matched_speakers = 0
 
-    for xml_path in xml_files:
-        print("\n" + "=" * 100)
-        print(f"Processing XML file: {xml_path}")
-
-        # Parse XML
-        with open(xml_path, "r", encoding="utf-8") as fh:
-            root = ET.fromstring(fh.read())
-
-        vergadering_el = root.find("vlos:vergadering", NS)
-        assert vergadering_el is not None, "XML lacks <vergadering> element."
-
-        xml_date_str = vergadering_el.findtext("vlos:datum", default="", namespaces=NS)
-        target_date = datetime.strptime(xml_date_str.split("T")[0], "%Y-%m-%d")
-        utc_start = target_date - timedelta(hours=LOCAL_TIMEZONE_OFFSET_HOURS)
-        utc_end = target_date + timedelta(days=1) - timedelta(hours=LOCAL_TIMEZONE_OFFSET_HOURS)
-
-        # Select canonical Vergadering via TK-API (reuse logic from activity matching)
-        v_filter = Vergadering.create_filter()
-        v_filter.filter_date_range(begin_datetime=utc_start, end_datetime=utc_end)
-        Vergadering.expand_params = ["Verslag"]
-        vergaderingen = api.get_items(Vergadering, filter=v_filter, max_items=5)
-        Vergadering.expand_params = None
-        assert vergaderingen, "No TKApi Vergadering found for XML file."
-        canonical_verg = vergaderingen[0]
-        print(f"  Canonical Vergadering: {canonical_verg.id} — {canonical_verg.titel}")
-
-        # Pre-fetch Kandidaten activiteiten in (begin-1h, einde+1h) timeframe
-        act_filter = Activiteit.create_filter()
-        buffer = timedelta(minutes=60)
-        act_filter.filter_date_range(
-            begin_datetime=(canonical_verg.begin - buffer).astimezone(timezone.utc),
-            end_datetime=(canonical_verg.einde + buffer).astimezone(timezone.utc),
-        )
-        candidate_acts = api.get_items(Activiteit, filter=act_filter, max_items=200)
-        print(f"  Retrieved {len(candidate_acts)} candidate activiteiten from TK-API")
-
-        # Index activities by rough start time (rounded minute) to aid quick lookup
-        def key_for_api_act(a: Activiteit) -> Tuple[str, str]:
-            ts = a.begin.replace(second=0, microsecond=0).isoformat()
-            soort = a.soort.value if a.soort and hasattr(a.soort, "value") else str(a.soort)
-            return ts, soort.lower()
-
-        api_index: Dict[Tuple[str, str], Activiteit] = {key_for_api_act(a): a for a in candidate_acts}
-
-        # Iterate XML activiteiten and map to API using simple key (time+soort) first; fallback by fuzzy titel
-        for xml_act in vergadering_el.findall("vlos:activiteit", NS):
-            xml_soort = (xml_act.get("soort") or "").lower()
-            xml_title = xml_act.findtext("vlos:titel", default="", namespaces=NS)
-            xml_onderwerp = xml_act.findtext("vlos:onderwerp", default="", namespaces=NS)
-
-            def ensure_aware(dt: Optional[datetime]) -> Optional[datetime]:
-                """Return tz-aware datetime (UTC) even when source is naive."""
-                if dt is None:
-                    return None
-                if dt.tzinfo is None or dt.tzinfo.utcoffset(dt) is None:
-                    return dt.replace(tzinfo=timezone.utc)
-                return dt
-
-            xml_start_raw = parse_xml_datetime(
-                xml_act.findtext("vlos:aanvangstijd", default=None, namespaces=NS)
-                or xml_act.findtext("vlos:markeertijdbegin", default=None, namespaces=NS)
-            )
-            xml_start = ensure_aware(xml_start_raw) or ensure_aware(canonical_verg.begin)
-
-            # --------------------------------------------------
-            # Improved matching: score all candidate_acts and pick best
-            # --------------------------------------------------
-
-            xml_end_raw = parse_xml_datetime(
-                xml_act.findtext("vlos:eindtijd", default=None, namespaces=NS)
-                or xml_act.findtext("vlos:markeertijdeind", default=None, namespaces=NS)
-            )
-            xml_end = ensure_aware(xml_end_raw) or ensure_aware(canonical_verg.einde)
-
-            best_match = None
-            best_score = 0.0
-            potential_matches = []  # collect (score, reasons, api_act)
-
-            for cand in candidate_acts:
-                score = 0.0
-                reasons = []
-
-                # ------------------------ Time proximity ------------------
-                time_score, time_reason = evaluate_time_match(
-                    xml_start,
-                    xml_end,
-                    cand.begin,
-                    cand.einde,
-                )
-                score += time_score
-                if time_score:
-                    reasons.append(time_reason)
-
-                # ------------------------ Soort comparison ---------------
-                cand_soort = (
-                    cand.soort.value.lower() if cand.soort and hasattr(cand.soort, "value") else str(cand.soort).lower()
-                )
-                if xml_soort and cand_soort:
-                    if xml_soort == cand_soort:
-                        score += SCORE_SOORT_EXACT
-                        reasons.append("Soort exact match")
-                    elif xml_soort in cand_soort:
-                        score += SCORE_SOORT_PARTIAL_XML_IN_API
-                        reasons.append("Soort partial XML in API")
-                    elif cand_soort in xml_soort:
-                        score += SCORE_SOORT_PARTIAL_API_IN_XML
-                        reasons.append("Soort partial API in XML")
-                    else:
-                        for alias in SOORT_ALIAS.get(xml_soort, []):
-                            if alias in cand_soort:
-                                score += SCORE_SOORT_PARTIAL_XML_IN_API
-                                reasons.append(f"Soort alias match ('{alias}')")
-                                break
-
-                # ------------------------ Onderwerp / titel fuzz ---------
-                cand_ond = (cand.onderwerp or "").lower()
-
-                norm_api_ond = normalize_topic(cand_ond)
-                norm_xml_ond = normalize_topic(xml_onderwerp.lower())
-                norm_xml_tit = normalize_topic(xml_title.lower())
-
-                if xml_onderwerp and cand_ond:
-                    if norm_xml_ond == norm_api_ond:
-                        score += SCORE_ONDERWERP_EXACT
-                        reasons.append("Onderwerp exact")
-                    else:
-                        ratio = fuzz.ratio(norm_xml_ond, norm_api_ond)
-                        if ratio >= FUZZY_SIMILARITY_THRESHOLD_HIGH:
-                            score += SCORE_ONDERWERP_FUZZY_HIGH
-                            reasons.append(f"Onderwerp fuzzy high ({ratio}%)")
-                        elif ratio >= FUZZY_SIMILARITY_THRESHOLD_MEDIUM:
-                            score += SCORE_ONDERWERP_FUZZY_MEDIUM
-                            reasons.append(f"Onderwerp fuzzy medium ({ratio}%)")
-
-                if xml_title and cand_ond:
-                    if norm_xml_tit == norm_api_ond:
-                        score += SCORE_TITEL_EXACT_VS_API_ONDERWERP
-                        reasons.append("Titel exact vs API onderwerp")
-                    else:
-                        ratio = fuzz.ratio(norm_xml_tit, norm_api_ond)
-                        if ratio >= FUZZY_SIMILARITY_THRESHOLD_HIGH:
-                            score += SCORE_TITEL_FUZZY_HIGH_VS_API_ONDERWERP
-                            reasons.append(f"Titel fuzzy high ({ratio}%)")
-                        elif ratio >= FUZZY_SIMILARITY_THRESHOLD_MEDIUM:
-                            score += SCORE_TITEL_FUZZY_MEDIUM_VS_API_ONDERWERP
-                            reasons.append(f"Titel fuzzy medium ({ratio}%)")
-
-                potential_matches.append({
-                    'score': score,
-                    'reasons': reasons,
-                    'api_act': cand,
-                })
-
-                if score > best_score:
-                    best_score = score
-                    best_match = cand
-
-            # Determine acceptance based on threshold or relative lead (same as activity match)
-            # Sort potentials by score desc
-            potential_matches.sort(key=lambda d: d['score'], reverse=True)
-
-            api_act = None
-            if best_match:
-                if best_score >= MIN_MATCH_SCORE_FOR_ACTIVITEIT:
-                    api_act = best_match
-                else:
-                    runner_up_score = potential_matches[1]['score'] if len(potential_matches) > 1 else 0.0
-                    if best_score - runner_up_score >= 1.0 and best_score >= 1.0:
-                        api_act = best_match
-
-            # Optionally print reasons for best match (debugging)
-            if api_act:
-                print(f"    ✅ BEST MATCH: API activiteit {api_act.id} (onderwerp='{api_act.onderwerp}') – score {best_score:.2f}")
-            else:
-                print(f"    ❌ No strong match found (best score {best_score:.2f})")
-
-            # --------------------------------------------------
-            # Track activiteit linkage success
-            # --------------------------------------------------
-            total_xml_acts += 1
-            if api_act:
-                total_linked_acts += 1
-
-            api_act_id = api_act.id if api_act else "UNKNOWN"
-            print("\n" + "-" * 80)
-            print(f"XML activiteit '{xml_title}' (soort={xml_soort}) mapped to API {api_act_id}")
-
-            # ------------------------------------------------------------------
-            # Extract all draadboekfragmenten (these carry speeches)
-            # ------------------------------------------------------------------
-            for frag in xml_act.findall(".//vlos:draadboekfragment", NS):
-                # Compile one clean text string
-                tekst_el = frag.find("vlos:tekst", NS)
-                if tekst_el is None:
-                    continue
-                speech_text = collapse_text(tekst_el)
-                if not speech_text:
-                    continue
-
-                # Gather speakers listed for this fragment
-                for sprek_el in frag.findall("vlos:sprekers/vlos:spreker", NS):
-                    v_first = sprek_el.findtext("vlos:voornaam", default="", namespaces=NS)
-                    v_last = sprek_el.findtext("vlos:achternaam", default="", namespaces=NS)
-                    fractie = sprek_el.findtext("vlos:fractie", default="", namespaces=NS)
-
-                    matched_persoon = find_best_persoon(api, v_first, v_last)
-                    # --------------------------------------------------
-                    # Track speaker resolution success
-                    # --------------------------------------------------
-                    total_speakers += 1
-                    if matched_persoon:
-                        total_matched_speakers += 1
-                    if matched_persoon:
-                        person_label = f"{matched_persoon.roepnaam or matched_persoon.voornaam} {matched_persoon.achternaam} (TK-API id {matched_persoon.id})"
-                    else:
-                        person_label = f"{v_first} {v_last} [NO MATCH]"
-
-                    print(f"  • {person_label} [{fractie}] —\n    \"{speech_text[:200]}...\"") 
+    with ThreadPoolExecutor(max_workers=MAX_FILE_WORKERS) as ex:
+        # map() yields in submission order, so the output still reads file by file
+        for file_res in ex.map(_process_file, xml_files, itertools.repeat(api)):
+            sys.stdout.write("\n".join(file_res.lines) + "\n")
+            total_xml_acts += file_res.total_xml_acts
+            total_linked_acts += file_res.total_linked_acts
+            total_speakers += file_res.total_speakers
+            total_matched_speakers += file_res.total_matched_speakers
 
     # --------------------
     # Summary output